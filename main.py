@@ -1,8 +1,19 @@
+import logging
+from multiprocessing import freeze_support
 from dotenv import load_dotenv
 from components import HanazawaApp
 
 load_dotenv()
 
 if __name__ == "__main__":
+    # Only here, extraction workers re-import this module and must not truncate the log
+    logging.basicConfig(
+        filename=f"dev.log",
+        level=logging.DEBUG,
+        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+        filemode='w'  # a = append, w = overwrite
+    )
+    # Needed by the extraction process pool in frozen builds
+    freeze_support()
     app = HanazawaApp()
-    app.run()
\ No newline at end of file
+    app.run()
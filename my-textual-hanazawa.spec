@@ -19,6 +19,7 @@ a = Analysis(
         'vlc',
         'googleapiclient',
         'googleapiclient.discovery',
+        'googleapiclient.discovery_cache',
         'yt_dlp',
         'pytubefix',
     ],
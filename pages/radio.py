@@ -1,5 +1,6 @@
 import re
 import os
+import asyncio
 import logging
 import pyfiglet
 from textual import work
@@ -24,18 +25,14 @@ from templates import BaseTemplate
 from utils.shoutcast_radio import *
 from utils.audio_player import ShoutcastRadioPlayer
 
-logging.basicConfig(
-    filename=f"dev.log",
-    level=logging.DEBUG,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    filemode='w'  # a = append, w = overwrite
-)
 logger = logging.getLogger(__name__)
 
 
 # Radio Page
 class RadioPage(BaseTemplate):
     CSS_PATH = "../assets/css/radio_page/main.tcss"
+    # Seconds the player gets to report a failure on a stream before the next mirror is tried
+    PLAYBACK_START_TIMEOUT = 5
 
     BINDINGS = [
         ("q", "quit", "Quit"),
@@ -94,6 +91,9 @@ class RadioPage(BaseTemplate):
     async def on_mount(self) -> None:
         await self._init_genre_list()
 
+    async def on_unmount(self) -> None:
+        await self.shoutcast_radio.aclose()
+
     @work(exclusive=True)
     async def on_tabbed_content_tab_activated(self, message: TabbedContent.TabActivated) -> None:
         tab_id = message.tab.id.replace("--content-tab-", "")
@@ -116,32 +116,10 @@ class RadioPage(BaseTemplate):
         list_view = message.list_view
         match list_view.id:
             case "top_stations_list" | "playing_station_list":
-                try:
-                    station = message.item.children[0]
-                    station_id = re.search(r"station-(\d+)", station.id).group(1)
-                    stream_url = self.shoutcast_radio.get_station_stream_url(station_id)
-                    self.current_stream_url = stream_url
-
-                    if not self.radio_player.is_available:
-                        self.notify("Player is not available. Please install player.", severity="error")
-                        return
-
-                    if not stream_url:
-                        self.notify("Could not get stream URL for this station", severity="error")
-                        return
-
-                    self.notify(f"Playing station {station_id}")
-
-                    current_station_label = self.query_one("#current_station", Label)
-                    current_station_label.update(station._content)
-
-                    self.query_one("#play_pause_button", Button).disabled = False
-                    self.query_one("#play_pause_button", Button).label = "⏸"
-
-                    self.radio_player.play_stream_url(stream_url)
-                except Exception as e:
-                    logger.error(f"Error playing station: {e}")
-                    self.notify(f"Error playing station: {str(e)}", severity="error")
+                station = message.item.children[0]
+                station_match = re.search(r"station-(\d+)", station.id or "")
+                if station_match:
+                    self.play_station(station_match.group(1), str(station.render()))
             case "genre_list":
                 try:
                     genre = message.item.children[0]
@@ -164,6 +142,52 @@ class RadioPage(BaseTemplate):
                     logger.error(f"Error loading stations by genre: {e}")
                     self.notify(f"Error loading stations by genre: {str(e)}", severity="error")
 
+    @work(exclusive=True, group="radio_station")
+    async def play_station(self, station_id: str, station_name: str) -> None:
+        """
+        Resolve the stream of a station and play it, in a worker so the UI never waits on the tunein playlist.
+
+        The fastest mirror is played, the others are tried in order when the player
+        fails on it within PLAYBACK_START_TIMEOUT seconds.
+        """
+        try:
+            if not self.radio_player.is_available:
+                self.notify("Player is not available. Please install player.", severity="error")
+                return
+
+            stream_urls = await self.shoutcast_radio.get_station_streams(station_id)
+            if not stream_urls:
+                self.notify("Could not get stream URL for this station", severity="error")
+                return
+
+            for stream_url in stream_urls:
+                try:
+                    self.radio_player.play_stream_url(stream_url)
+                except Exception as e:
+                    logger.warning(f"Error playing stream {stream_url} of station {station_id}: {e}")
+                    continue
+
+                # The player fails on a dead mirror asynchronously, play_stream_url does not raise
+                if await asyncio.to_thread(self.radio_player.wait_for_playback, self.PLAYBACK_START_TIMEOUT):
+                    break
+                logger.warning(f"Player failed on stream {stream_url} of station {station_id}")
+            else:
+                self.shoutcast_radio.forget_station_streams(station_id)
+                self.notify("None of the streams of this station could be played", severity="error")
+                return
+
+            self.current_stream_url = stream_url
+            self.notify(f"Playing station {station_id}")
+
+            current_station_label = self.query_one("#current_station", Label)
+            current_station_label.update(station_name)
+
+            self.query_one("#play_pause_button", Button).disabled = False
+            self.query_one("#play_pause_button", Button).label = "⏸"
+        except Exception as e:
+            logger.error(f"Error playing station: {e}")
+            self.notify(f"Error playing station: {str(e)}", severity="error")
+
     @work(exclusive=True)
     async def on_input_submitted(self, event: Input.Submitted) -> None:
         search_query = event.value.strip()
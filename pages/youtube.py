@@ -1,7 +1,11 @@
 import os
+import time
+import asyncio
 import logging
+from functools import partial
 from rich.text import Text
 from textual import work
+from textual.worker import get_current_worker
 from templates import BaseTemplate
 from textual.app import ComposeResult
 from textual.containers import (
@@ -24,29 +28,63 @@ from textual.widgets import (
     DataTable,
 )
 from textual.events import Click
-from utils.youtube import YoutubeVideoService
+from utils.youtube_video import YoutubeVideo
+from utils.youtube import (
+    YoutubeVideoService,
+    AudioUrlPrefetcher,
+    AUDIO_PREFETCH_WAIT_TIMEOUT,
+    image_to_ascii,
+    thumbnail_render_cache,
+)
 from utils.audio_player import *
 
-logging.basicConfig(
-    filename=f"dev.log",
-    level=logging.DEBUG,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    filemode='w'  # a = append, w = overwrite
-)
 logger = logging.getLogger(__name__)
 
+# Thumbnails are rendered with rich-pixels half-blocks ("color") or as grayscale characters ("ascii")
+THUMBNAIL_MODE = os.getenv("YOUTUBE_THUMBNAIL_MODE", "color")
+THUMBNAIL_WIDTH = 40
+THUMBNAIL_DEBOUNCE = 0.15
+
 class YoutubeVideoContainer(Container):
     """Container for Youtube video items"""
-    def __init__(self, video) -> None:
+    def __init__(self, video: YoutubeVideo) -> None:
         super().__init__()
         self.video = video
         self.classes = "youtube_result_item_container"
+        self.thumbnail_loaded = False
+        self.thumbnail_loading = False
 
     def compose(self) -> ComposeResult:
         with Container(classes="youtube_result_info"):
-            # yield Static(self.video["ascii_art_thumbnail"], classes="youtube_result_thumbnail")
-            yield Static(self.video["title"], classes="youtube_result_title")
-            yield Static(f"{self.video["channel_title"]}", classes="youtube_result_metadata")
+            yield Static("", classes="youtube_result_thumbnail")
+            yield Static(self.video.title, classes="youtube_result_title")
+            yield Static(self.video.channel_title, classes="youtube_result_metadata")
+
+    def set_in_view(self, in_view: bool) -> None:
+        """Load the thumbnail once the card is scrolled into view, stop loading it once it leaves"""
+        if in_view and not self.thumbnail_loaded and not self.thumbnail_loading:
+            self.thumbnail_loading = True
+            self.load_thumbnail()
+        elif not in_view and self.thumbnail_loading:
+            self.thumbnail_loading = False
+            self.workers.cancel_node(self)
+
+    @work(exclusive=True, thread=True)
+    def load_thumbnail(self) -> None:
+        """Fetch and render the thumbnail off the event loop"""
+        try:
+            thumbnail = image_to_ascii(self.video.thumbnail_url, width=THUMBNAIL_WIDTH // 2, mode=THUMBNAIL_MODE)
+        except Exception as e:
+            logger.error(f"Error loading thumbnail for {self.video.video_id}: {e}")
+            thumbnail = ""
+
+        if not get_current_worker().is_cancelled:
+            self.app.call_from_thread(self.show_thumbnail, thumbnail)
+
+    def show_thumbnail(self, thumbnail) -> None:
+        self.thumbnail_loaded = True
+        self.thumbnail_loading = False
+        self.query_one(".youtube_result_thumbnail", Static).update(thumbnail)
 
 class YoutubePage(BaseTemplate):
     CSS_PATH = "../assets/css/youtube_page/main.tcss"
@@ -56,12 +94,45 @@ class YoutubePage(BaseTemplate):
         ("r", "switch_mode('radio')", "Radio"),
     ]
 
+    # Rows whose audio URL is resolved in the background, counted from the top and from the cursor
+    AUDIO_PREFETCH_ROWS = int(os.getenv("YOUTUBE_AUDIO_PREFETCH_ROWS", 3))
+    AUDIO_PREFETCH_WORKERS = int(os.getenv("YOUTUBE_AUDIO_PREFETCH_WORKERS", 2))
+
+    SEARCH_PAGE_SIZE = 10
+    SEARCH_FILTERS = {"order": "viewCount"}
+    # Search while typing, the remote search starts once typing pauses for LIVE_SEARCH_DEBOUNCE seconds
+    LIVE_SEARCH = os.getenv("YOUTUBE_LIVE_SEARCH", "1") != "0"
+    LIVE_SEARCH_DEBOUNCE = 0.4
+    LIVE_SEARCH_MIN_LENGTH = 3
+    # Fetch the next page once the cursor is this many rows from the bottom
+    LOAD_MORE_THRESHOLD = 3
+    # Seconds the player gets to report a failure on a stream URL, e.g. a 403 on an expired one
+    PLAYBACK_START_TIMEOUT = 5
+
     def __init__(self) -> None:
         super().__init__(subtitle="Youtube")
         self.youtube_video_service = YoutubeVideoService()
+        self.audio_url_prefetcher = AudioUrlPrefetcher(
+            self.youtube_video_service,
+            max_workers=self.AUDIO_PREFETCH_WORKERS,
+        )
         self.youtube_audio_player = YoutubeAudioPlayer()
         self.youtube_video_result_view_type = 'datatable' # 'container' or 'datatable'
         self.playing_url = None
+        self.playing_video_id = None
+        self.search_target_rows = self.SEARCH_PAGE_SIZE
+        self._load_more_results = asyncio.Event()
+        self._result_count = 0
+        self.videos_by_id = {}
+        # The first AUDIO_PREFETCH_ROWS results, kept in the prefetch set while the cursor moves
+        self.top_video_ids = []
+        self.highlighted_video_id = None
+        # The query whose remote results are shown or streaming, and the worker of the latest search
+        self.remote_search_query = None
+        self.search_worker = None
+        # Results of a search run while typing, their audio is only prefetched once the user commits to them
+        self.live_results = False
+        self._visible_thumbnails_timer = None
 
     def compose(self) -> ComposeResult:
         yield Header(
@@ -100,6 +171,12 @@ class YoutubePage(BaseTemplate):
                         else:
                             yield DataTable(id="youtube_datatable_type_results")
 
+                if self.youtube_video_result_view_type == 'datatable':
+                    with Vertical(id="youtube_preview_pane"):
+                        yield Static("", id="youtube_thumbnail_preview")
+                        yield Static("", id="youtube_preview_title")
+                        yield Static("", id="youtube_preview_metadata")
+
         with Container(id="youtube_player_bar"):
             with Horizontal(id="youtube_player_info"):
                 yield Label("Now Playing: ", id="youtube_player_status")
@@ -110,43 +187,196 @@ class YoutubePage(BaseTemplate):
         yield Footer()
 
     def on_mount(self) -> None:
+        if self.youtube_video_result_view_type == 'container':
+            # Grid cards only load their thumbnail while they are in view
+            results_container = self.query_one("#youtube_results_container", VerticalScroll)
+            self.watch(results_container, "scroll_y", self.schedule_visible_thumbnails_update, init=False)
+            # Changes once newly mounted cards are laid out
+            self.watch(results_container, "virtual_size", self.schedule_visible_thumbnails_update, init=False)
+            return
+
         result_datatable = self.query_one("#youtube_datatable_type_results", DataTable)
         result_datatable.cursor_type = "row"
         result_datatable.add_column("Title", width=40)
         result_datatable.add_column("Channel", width=20)
 
+    def on_resize(self) -> None:
+        self.schedule_visible_thumbnails_update()
+
+    def schedule_visible_thumbnails_update(self) -> None:
+        """Update the grid thumbnails once scrolling and layout have settled, skipping cards only scrolled past"""
+        if self._visible_thumbnails_timer is not None:
+            self._visible_thumbnails_timer.stop()
+        self._visible_thumbnails_timer = self.set_timer(THUMBNAIL_DEBOUNCE, self.update_visible_thumbnails)
+
+    def update_visible_thumbnails(self) -> None:
+        """Start thumbnail loads for the grid cards in view and cancel them for the ones out of view"""
+        if self.youtube_video_result_view_type != 'container':
+            return
+
+        results_container = self.query_one("#youtube_results_container", VerticalScroll)
+        for video_container in results_container.query(YoutubeVideoContainer):
+            video_container.set_in_view(results_container.can_view_partial(video_container))
+
+    def on_unmount(self) -> None:
+        self.audio_url_prefetcher.cancel_all()
+        self.youtube_video_service.close()
+
     def on_input_submitted(self, event: Input.Submitted):
         """Handle search input submission"""
-        self.clean_container_results()
-
         search_input = self.query_one("#youtube_search_input", Input)
         search_query = search_input.value.strip()
 
-        if search_query:
-            videos = self.youtube_video_service.search_video(query=search_query, max_results=10, filters={"order": "viewCount"})
+        # Live search already runs the remote search for this query, submitting commits to its results
+        if search_query and search_query == self.remote_search_query:
+            self.live_results = False
+            self.prefetch_audio_urls()
+        elif search_query:
+            self.search_videos(search_query)
+
+    def on_input_changed(self, event: Input.Changed) -> None:
+        """Search while typing, see search_videos"""
+        if event.input.id != "youtube_search_input" or not self.LIVE_SEARCH:
+            return
+
+        search_query = event.value.strip()
+        if len(search_query) < self.LIVE_SEARCH_MIN_LENGTH:
+            self.workers.cancel_group(self, "youtube_search")
+            self.remote_search_query = None
+            return
+
+        if search_query != self.remote_search_query:
+            self.search_videos(search_query, live=True)
+
+    @work(exclusive=True, group="youtube_search")
+    async def search_videos(self, search_query: str, live: bool = False) -> None:
+        """
+        Stream search results into the result view in a worker.
+
+        Suggestions that need no network (cached results, matching results of
+        a shorter query and the local video index) are shown first and replaced
+        by the remote results once the first one arrives, so something shows up
+        right away and offline searches still find videos seen before.
+
+        In live mode the remote search waits LIVE_SEARCH_DEBOUNCE seconds
+        first. Each keystroke starts a new search, which cancels the previous
+        one, so only the query typing paused on reaches the backends. Live
+        searches skip the backends that spend API quota, and their audio is
+        only prefetched once the query is submitted or the results are browsed.
+
+        Rows are added as the service yields them. Once the view holds
+        `search_target_rows` rows the stream is paused until the cursor gets
+        near the bottom. A new search cancels the one still running.
+        """
+        search_input = self.query_one("#youtube_search_input", Input)
+        self.search_worker = get_current_worker()
+        self.remote_search_query = None
+        self.clean_container_results()
+        self.clear_preview()
+        self.search_target_rows = self.SEARCH_PAGE_SIZE
+        self._load_more_results = asyncio.Event()
+        self.live_results = live
 
-            if not videos:
-                search_input.placeholder = "No results found"
-                search_input.value = ""
-                return
+        suggestions = await self.youtube_video_service.suggest_videos_async(
+            search_query, self.SEARCH_PAGE_SIZE, self.SEARCH_FILTERS
+        )
+        for video in suggestions:
+            self.add_search_result(video, prefetch_audio=not live)
+        showing_suggestions = bool(suggestions)
+
+        if live:
+            await asyncio.sleep(self.LIVE_SEARCH_DEBOUNCE)
+
+        self.remote_search_query = search_query
+        stream = self.youtube_video_service.aiter_search_video(
+            query=search_query,
+            page_size=self.SEARCH_PAGE_SIZE,
+            filters=self.SEARCH_FILTERS,
+            on_refresh=partial(self._on_search_results_refreshed, search_query, self.search_worker),
+            spend_quota=not live,
+        )
 
-            # Clear existing results
-            container_id = "#youtube_container_type_results" if self.youtube_video_result_view_type == 'container' else "#youtube_datatable_type_results"
-            container_type = Grid if self.youtube_video_result_view_type == 'container' else DataTable
-            container = self.query_one(container_id, container_type)
-            container.remove_children()
+        try:
+            async for video in stream:
+                if showing_suggestions:
+                    showing_suggestions = False
+                    self.clean_container_results()
+                    self.clear_preview()
+
+                self.add_search_result(video, prefetch_audio=not self.live_results)
+
+                while self._result_count >= self.search_target_rows:
+                    self._load_more_results.clear()
+                    await self._load_more_results.wait()
+        except Exception as e:
+            logger.error(f"Error searching videos: {e}")
+            # Let submitting the query again retry it
+            self.remote_search_query = None
+            if showing_suggestions:
+                self.notify("Search failed, showing videos found earlier", severity="warning")
+            else:
+                self.notify("Error searching videos", severity="error")
+        finally:
+            await stream.aclose()
+
+        # Never wipe what the user is still typing
+        if not self._result_count and not live:
+            search_input.placeholder = "No results found"
+            search_input.value = ""
+
+    def load_more_results(self) -> None:
+        """Let the running search stream fetch another page"""
+        self.search_target_rows = self._result_count + self.SEARCH_PAGE_SIZE
+        self._load_more_results.set()
+
+    def _on_search_results_refreshed(self, search_query: str, search_worker, videos: list) -> None:
+        """Called from a background thread when stale cached results of a search have been refreshed"""
+        self.app.call_from_thread(self.show_search_results, search_query, search_worker, videos)
+
+    def show_search_results(self, search_query: str, search_worker, videos: list) -> None:
+        """
+        Render refreshed results, unless the user searched for something else
+        since, or the view already streamed past them
+        """
+        if search_query != self.remote_search_query or search_worker is not self.search_worker:
+            return
+        if search_worker.is_cancelled or self._result_count > len(videos):
+            return
 
-            for video in videos:
-                if self.youtube_video_result_view_type == 'container':
-                    video_container = YoutubeVideoContainer(video=video)
-                    container.mount(video_container)
+        self.clean_container_results()
 
-                if self.youtube_video_result_view_type == 'datatable':
-                    styled_row = [
-                        Text(self.truncate_text(video["title"], 50), style="italic #03AC13", justify="left"),
-                        Text(self.truncate_text(video["channel_title"], 20), style="italic #03AC13", justify="left")
-                    ]
-                    container.add_row(*styled_row, key=video["video_id"])
+        for video in videos:
+            self.add_search_result(video, prefetch_audio=not self.live_results)
+
+    def add_search_result(self, video: YoutubeVideo, prefetch_audio: bool = True) -> None:
+        """Append a single search result to the current result view"""
+        container_id = "#youtube_container_type_results" if self.youtube_video_result_view_type == 'container' else "#youtube_datatable_type_results"
+        container_type = Grid if self.youtube_video_result_view_type == 'container' else DataTable
+        container = self.query_one(container_id, container_type)
+
+        if self.youtube_video_result_view_type == 'container':
+            video_container = YoutubeVideoContainer(video=video)
+            container.mount(video_container)
+
+        if self.youtube_video_result_view_type == 'datatable':
+            if video.video_id in container.rows:
+                return
+            self.videos_by_id[video.video_id] = video
+            styled_row = [
+                Text(self.truncate_text(video.title, 50), style="italic #03AC13", justify="left"),
+                Text(self.truncate_text(video.channel_title, 20), style="italic #03AC13", justify="left")
+            ]
+            container.add_row(*styled_row, key=video.video_id)
+
+        self._result_count += 1
+        if len(self.top_video_ids) < self.AUDIO_PREFETCH_ROWS:
+            self.top_video_ids.append(video.video_id)
+            if prefetch_audio:
+                self.prefetch_audio_urls()
+
+    def prefetch_audio_urls(self, video_ids: list = ()) -> None:
+        """Prefetch audio URLs for the given videos, then the top results, in one call so none cancels the other"""
+        self.audio_url_prefetcher.prefetch(list(dict.fromkeys([*video_ids, *self.top_video_ids])))
 
     def on_list_view_selected(self, message: ListView.Selected) -> None:
         """Handle selection of list view items"""
@@ -169,17 +399,76 @@ class YoutubePage(BaseTemplate):
             row = result_table.get_row_at(event.cursor_row)
             video_title = row[0].plain
             video_id = event.row_key.value
-            audio_url = self.youtube_video_service.get_video_audio_url(video_id=video_id)
 
-            if audio_url:
-                self.playing_url = audio_url
-                play_pause_button = self.query_one("#youtube_play_pause_button", Button)
-                play_pause_button.disabled = False
-                play_pause_button.label = "S"
-                self.query_one("#youtube_current_video", Label).update(f"{video_title}")
-
-                # Play the audio
-                self.youtube_audio_player.play_stream_url(audio_url)
+            self.play_video(video_id, video_title)
+
+    def on_data_table_row_highlighted(self, event: DataTable.RowHighlighted) -> None:
+        """Prefetch audio URLs for the highlighted row and the rows right after it"""
+        result_table = event.data_table
+        # Rows added by a live search move the cursor too, only browsing them counts
+        if not self.live_results or result_table.has_focus:
+            rows = result_table.ordered_rows[event.cursor_row:event.cursor_row + self.AUDIO_PREFETCH_ROWS]
+            self.prefetch_audio_urls([row.key.value for row in rows])
+
+        if event.row_key is not None:
+            self.show_preview(event.row_key.value)
+
+        near_bottom = event.cursor_row >= result_table.row_count - self.LOAD_MORE_THRESHOLD
+        if near_bottom and self._result_count >= self.search_target_rows:
+            self.load_more_results()
+
+    def show_preview(self, video_id: str) -> None:
+        """Show the highlighted video in the preview pane, rendering its thumbnail in the background"""
+        video = self.videos_by_id.get(video_id)
+        if video is None or video_id == self.highlighted_video_id:
+            return
+
+        self.highlighted_video_id = video_id
+        self.query_one("#youtube_preview_title", Static).update(video.title)
+        self.query_one("#youtube_preview_metadata", Static).update(video.channel_title)
+
+        cache_key = (video.thumbnail_url, THUMBNAIL_WIDTH, THUMBNAIL_MODE)
+        thumbnail = thumbnail_render_cache.get(cache_key)
+        if thumbnail is not None:
+            self.workers.cancel_group(self, "youtube_thumbnail")
+            self.query_one("#youtube_thumbnail_preview", Static).update(thumbnail)
+            return
+
+        self.query_one("#youtube_thumbnail_preview", Static).update("Loading...")
+        self.load_thumbnail(video_id, cache_key[0])
+
+    def clear_preview(self) -> None:
+        """Empty the preview pane"""
+        self.highlighted_video_id = None
+        self.workers.cancel_group(self, "youtube_thumbnail")
+
+        if self.youtube_video_result_view_type == 'datatable':
+            for preview_id in ("#youtube_thumbnail_preview", "#youtube_preview_title", "#youtube_preview_metadata"):
+                self.query_one(preview_id, Static).update("")
+
+    @work(exclusive=True, group="youtube_thumbnail", thread=True)
+    def load_thumbnail(self, video_id: str, url: str) -> None:
+        """Fetch and render a thumbnail off the event loop, dropping it if the cursor moved on"""
+        # Skip the rows the cursor only passes over, a newer highlight cancels this worker
+        time.sleep(THUMBNAIL_DEBOUNCE)
+        if get_current_worker().is_cancelled:
+            return
+
+        try:
+            thumbnail = image_to_ascii(url, width=THUMBNAIL_WIDTH, mode=THUMBNAIL_MODE)
+        except Exception as e:
+            logger.error(f"Error loading thumbnail for {video_id}: {e}")
+            thumbnail = ""
+
+        if get_current_worker().is_cancelled:
+            return
+        self.app.call_from_thread(self.show_thumbnail_preview, video_id, thumbnail)
+
+    def show_thumbnail_preview(self, video_id: str, thumbnail: str) -> None:
+        """Show a rendered thumbnail in the preview pane, unless another row is highlighted by now"""
+        if video_id != self.highlighted_video_id:
+            return
+        self.query_one("#youtube_thumbnail_preview", Static).update(thumbnail)
 
     def on_button_pressed(self, event: Button.Pressed) -> None:
         if event.button.id == "youtube_play_pause_button":
@@ -187,12 +476,64 @@ class YoutubePage(BaseTemplate):
                 self.youtube_audio_player.stop()
                 event.button.label = "P"
             else:
-                self.youtube_audio_player.play_stream_url(self.playing_url)
-                event.button.label = "S"
+                self.play_video(self.playing_video_id)
+
+    @work(exclusive=True, group="youtube_player")
+    async def play_video(self, video_id: str, video_title: str = None) -> None:
+        """
+        Resolve and play the audio of a video in a worker.
+
+        The audio URL usually comes from the service cache. If the player
+        fails on it, e.g. a 403 on an expired googlevideo URL, it is
+        invalidated and resolved once more. Errors of the player itself, such
+        as no player being available, are reported right away.
+        """
+        if not video_id:
+            return
+
+        # Bounded, a hung prefetch falls through to resolving the URL here
+        await asyncio.to_thread(self.audio_url_prefetcher.wait, video_id, AUDIO_PREFETCH_WAIT_TIMEOUT)
+
+        for attempt in range(2):
+            try:
+                audio_url = await self.youtube_video_service.get_video_audio_url_async(video_id=video_id)
+            except Exception as e:
+                logger.error(f"Error getting audio URL for {video_id}: {e}")
+                self.notify("Could not get audio for this video", severity="error")
+                return
+
+            try:
+                self.youtube_audio_player.play_stream_url(audio_url)
+            except Exception as e:
+                logger.error(f"Error playing {video_id}: {e}")
+                self.notify(f"Could not play this video: {e}", severity="error")
+                return
+
+            if not await asyncio.to_thread(self.youtube_audio_player.wait_for_playback, self.PLAYBACK_START_TIMEOUT):
+                logger.warning(f"Player failed on the audio URL of {video_id}, resolving it again")
+                self.youtube_video_service.invalidate_audio_url(video_id)
+                continue
+
+            self.playing_video_id = video_id
+            self.playing_url = audio_url
+
+            play_pause_button = self.query_one("#youtube_play_pause_button", Button)
+            play_pause_button.disabled = False
+            play_pause_button.label = "S"
+            if video_title is not None:
+                self.query_one("#youtube_current_video", Label).update(f"{video_title}")
+            return
+
+        self.notify("Could not play this video", severity="error")
 
     def clear_search_results(self) -> None:
         """Clear search results"""
         self.playing_url = None
+        self.playing_video_id = None
+        self.audio_url_prefetcher.cancel_all()
+        self.workers.cancel_group(self, "youtube_search")
+        self.remote_search_query = None
+        self.clear_preview()
 
         search_input = self.query_one("#youtube_search_input", Input)
         search_input.value = ""
@@ -204,6 +545,9 @@ class YoutubePage(BaseTemplate):
         container_id = "#youtube_container_type_results" if self.youtube_video_result_view_type == 'container' else "#youtube_datatable_type_results"
         container_type = Grid if self.youtube_video_result_view_type == 'container' else DataTable
         container = self.query_one(container_id, container_type)
+        self._result_count = 0
+        self.videos_by_id = {}
+        self.top_video_ids = []
 
         if isinstance(container, DataTable):
             container.clear()
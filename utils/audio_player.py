@@ -1,8 +1,11 @@
 import os
+import time
 import subprocess
 import threading
 from abc import ABC, abstractmethod
 
+PLAYBACK_POLL_INTERVAL = 0.1
+
 
 class AudioPlayer(ABC):
     @abstractmethod
@@ -13,11 +16,29 @@ class AudioPlayer(ABC):
     def stop(self) -> None:
         pass
 
+    def wait_for_playback(self, timeout: float) -> bool:
+        """
+        Wait for the stream started by play_stream_url to play.
+
+        Players that cannot report on the stream assume it plays.
+
+        Args:
+            timeout (float): The maximum number of seconds to wait.
+
+        Returns:
+            bool: False if the player failed on the stream, e.g. a 403 or a dead
+            server, True once it plays or is still loading at the timeout.
+        """
+        return True
+
 
 class VLCPlayer(AudioPlayer):
     def __init__(self):
         self.player = None
         self.instance = None
+        self._failed = threading.Event()
+        # Guards the handles, wait_for_playback polls them from another thread
+        self._lock = threading.Lock()
         try:
             import vlc
             import platform
@@ -31,28 +52,66 @@ class VLCPlayer(AudioPlayer):
         if not self.is_available:
             raise RuntimeError("VLC is not available. Cannot play audio.")
 
-        if self.player is not None:
-            self.player.stop()
-            self.player.release()
-        if self.instance is not None:
-            self.instance.release()
-
         import vlc
-        self.instance = vlc.Instance(['--no-video', '--quiet'])
-        self.player = self.instance.media_player_new()
-        media = self.instance.media_new(url)
-        self.player.set_media(media)
-        self.player.play()
+        with self._lock:
+            if self.player is not None:
+                self.player.stop()
+                self.player.release()
+            if self.instance is not None:
+                self.instance.release()
+
+            self.instance = vlc.Instance(['--no-video', '--quiet'])
+            self.player = self.instance.media_player_new()
+            # play() returns before VLC opens the stream, failures are only reported through events
+            failed = self._failed = threading.Event()
+            self.player.event_manager().event_attach(
+                vlc.EventType.MediaPlayerEncounteredError, lambda event: failed.set()
+            )
+            media = self.instance.media_new(url)
+            self.player.set_media(media)
+            self.player.play()
+
+    def wait_for_playback(self, timeout: float) -> bool:
+        """
+        Wait for the stream to play, see AudioPlayer.wait_for_playback.
+
+        The handle is only polled under the lock and while it is still the
+        current one. Once another stream or stop() replaced it, it may be
+        released, and nothing more is reported about the old stream.
+        """
+        import vlc
+        with self._lock:
+            player = self.player
+            failed = self._failed
+        if player is None:
+            return False
+
+        deadline = time.monotonic() + timeout
+        while True:
+            with self._lock:
+                if self.player is not player:
+                    return True
+                state = player.get_state()
+            if failed.is_set() or state in (vlc.State.Error, vlc.State.Ended):
+                return False
+            if state == vlc.State.Playing:
+                return True
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return True
+            failed.wait(min(PLAYBACK_POLL_INTERVAL, remaining))
 
     def stop(self) -> None:
-        if self.player:
-            self.player.stop()
-            self.player.release()
-            self.player = None
+        with self._lock:
+            if self.player:
+                self.player.stop()
+                self.player.release()
+                self.player = None
     
     def pause(self) -> None:
-        if self.player:
-            self.player.pause()
+        with self._lock:
+            if self.player:
+                self.player.pause()
 
 
 class WindowsMediaPlayer(AudioPlayer):
@@ -163,6 +222,22 @@ class BasePlayer:
 
         raise RuntimeError("All available players failed to play the stream")
 
+    def wait_for_playback(self, timeout: float) -> bool:
+        """
+        Wait for the current stream to play, see AudioPlayer.wait_for_playback.
+
+        Returns:
+            bool: False if nothing is playing or the player failed on the stream.
+        """
+        player = self.current_player
+        if player is None:
+            return False
+
+        if not player.wait_for_playback(timeout):
+            self.is_playing = False
+            return False
+        return True
+
     def stop(self) -> None:
         """Stop the current player."""
         self.is_playing = False
@@ -0,0 +1,127 @@
+import time
+import threading
+from collections import deque
+
+CIRCUIT_CLOSED = "closed"
+CIRCUIT_OPEN = "open"
+CIRCUIT_HALF_OPEN = "half_open"
+
+
+class BackendHealth:
+    """
+    Rolling health statistics and a circuit breaker for one backend.
+
+    The breaker opens after `failure_threshold` consecutive failures. Once
+    `reset_timeout` seconds have passed it goes half-open and lets a single
+    probe call through: a success closes it again, a failure re-opens it.
+    """
+    def __init__(self, name: str, window: int = 50, failure_threshold: int = 3, reset_timeout: float = 60.0):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = CIRCUIT_CLOSED
+        self.consecutive_failures = 0
+        self._latencies = deque(maxlen=window)
+        self._outcomes = deque(maxlen=window)
+        self._opened_at = None
+        self._probe_started_at = None
+        self._lock = threading.Lock()
+
+    def allow_request(self) -> bool:
+        """
+        Check whether a call may go to the backend, moving an expired open breaker to half-open.
+
+        Returns:
+            bool: True if the backend may be called.
+        """
+        now = time.monotonic()
+        with self._lock:
+            if self.state == CIRCUIT_OPEN:
+                if now - self._opened_at < self.reset_timeout:
+                    return False
+                self.state = CIRCUIT_HALF_OPEN
+                self._probe_started_at = None
+
+            if self.state == CIRCUIT_HALF_OPEN:
+                # Only one probe at a time, unless the previous one never reported back
+                if self._probe_started_at is not None and now - self._probe_started_at < self.reset_timeout:
+                    return False
+                self._probe_started_at = now
+
+            return True
+
+    def record_success(self, latency: float) -> None:
+        with self._lock:
+            self._latencies.append(latency)
+            self._outcomes.append(True)
+            self.consecutive_failures = 0
+            self.state = CIRCUIT_CLOSED
+            self._probe_started_at = None
+
+    def record_failure(self, latency: float = None) -> None:
+        with self._lock:
+            if latency is not None:
+                self._latencies.append(latency)
+            self._outcomes.append(False)
+            self.consecutive_failures += 1
+            if self.state == CIRCUIT_HALF_OPEN or self.consecutive_failures >= self.failure_threshold:
+                self.state = CIRCUIT_OPEN
+                self._opened_at = time.monotonic()
+                self._probe_started_at = None
+
+    def record_empty(self) -> None:
+        """Record a call that answered without results, freeing a half-open probe slot without closing the breaker."""
+        with self._lock:
+            self._probe_started_at = None
+
+    def trip(self) -> None:
+        """Open the breaker right away, e.g. when the backend cannot be constructed."""
+        with self._lock:
+            self._outcomes.append(False)
+            self.consecutive_failures += 1
+            self.state = CIRCUIT_OPEN
+            self._opened_at = time.monotonic()
+            self._probe_started_at = None
+
+    def percentile(self, percent: float) -> float:
+        """
+        Get a latency percentile over the rolling window.
+
+        Args:
+            percent (float): The percentile, between 0 and 100.
+
+        Returns:
+            float: The latency in seconds, or None when nothing was recorded yet.
+        """
+        with self._lock:
+            latencies = sorted(self._latencies)
+        if not latencies:
+            return None
+        index = min(len(latencies) - 1, int(round(percent / 100 * (len(latencies) - 1))))
+        return latencies[index]
+
+    @property
+    def error_rate(self) -> float:
+        with self._lock:
+            if not self._outcomes:
+                return 0.0
+            return self._outcomes.count(False) / len(self._outcomes)
+
+    def sort_key(self) -> tuple:
+        """Key that orders healthy, reliable and fast backends first."""
+        p50 = self.percentile(50)
+        return (
+            self.state != CIRCUIT_CLOSED,
+            round(self.error_rate, 1),
+            p50 if p50 is not None else float("inf"),
+        )
+
+    def stats(self) -> dict:
+        return {
+            "name": self.name,
+            "state": self.state,
+            "error_rate": self.error_rate,
+            "p50": self.percentile(50),
+            "p95": self.percentile(95),
+            "calls": len(self._outcomes),
+        }
@@ -0,0 +1,262 @@
+import os
+import json
+import time
+import sqlite3
+import logging
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from dotenv import load_dotenv
+
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+_MISSING = object()
+# Access times of read entries are written in batches of this size, or with the next write
+ACCESS_FLUSH_SIZE = 64
+
+
+def get_cache_dir() -> Path:
+    """
+    Get the directory used for on-disk caches, creating it if needed.
+
+    Uses the CACHE_DIR environment variable when set, otherwise
+    ~/.cache/my-textual-hanazawa.
+    """
+    cache_dir = Path(os.getenv("CACHE_DIR") or Path.home() / ".cache" / "my-textual-hanazawa")
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    return cache_dir
+
+
+class SQLiteCache:
+    """
+    Persistent key/value cache backed by a SQLite file.
+
+    Values are stored as JSON. Entries older than `ttl` seconds are treated
+    as expired, and the least recently used entries are evicted once the
+    cache holds more than `max_entries` rows. Reads record their access time
+    in memory, it is written in batches so reads do not commit.
+    """
+    def __init__(self, path, ttl: float = None, max_entries: int = 1000):
+        self.path = str(path)
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._pending_access = {}
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS cache ("
+            "key TEXT PRIMARY KEY, value TEXT NOT NULL, "
+            "created_at REAL NOT NULL, accessed_at REAL NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS cache_accessed_at ON cache (accessed_at)")
+        self._conn.commit()
+
+    def get(self, key: str, default=None):
+        """
+        Get a fresh value from the cache.
+
+        Args:
+            key (str): The cache key.
+            default: Returned when the key is missing or expired.
+        """
+        value, age = self.get_with_age(key)
+        if value is _MISSING or (self.ttl is not None and age > self.ttl):
+            return default
+        return value
+
+    def get_with_age(self, key: str):
+        """
+        Get a value from the cache regardless of its TTL.
+
+        Args:
+            key (str): The cache key.
+
+        Returns:
+            tuple: The value and its age in seconds, or (_MISSING, None).
+        """
+        now = time.time()
+        with self._lock:
+            try:
+                row = self._conn.execute(
+                    "SELECT value, created_at FROM cache WHERE key = ?", (key,)
+                ).fetchone()
+                if row is None:
+                    return _MISSING, None
+                self._pending_access[key] = now
+                if len(self._pending_access) >= ACCESS_FLUSH_SIZE:
+                    self._flush_access()
+                    self._conn.commit()
+            except sqlite3.Error as e:
+                logger.error(f"Error reading cache {self.path}: {e}")
+                return _MISSING, None
+
+        return json.loads(row[0]), now - row[1]
+
+    def set(self, key: str, value) -> None:
+        """
+        Store a JSON serializable value in the cache.
+
+        Args:
+            key (str): The cache key.
+            value: The value to store.
+        """
+        now = time.time()
+        with self._lock:
+            try:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO cache (key, value, created_at, accessed_at) VALUES (?, ?, ?, ?)",
+                    (key, json.dumps(value), now, now),
+                )
+                self._pending_access.pop(key, None)
+                self._evict()
+                self._conn.commit()
+            except (sqlite3.Error, TypeError, ValueError) as e:
+                logger.error(f"Error writing cache {self.path}: {e}")
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._pending_access.pop(key, None)
+            try:
+                self._conn.execute("DELETE FROM cache WHERE key = ?", (key,))
+                self._conn.commit()
+            except sqlite3.Error as e:
+                logger.error(f"Error deleting from cache {self.path}: {e}")
+
+    def clear(self) -> None:
+        with self._lock:
+            self._pending_access.clear()
+            try:
+                self._conn.execute("DELETE FROM cache")
+                self._conn.commit()
+            except sqlite3.Error as e:
+                logger.error(f"Error clearing cache {self.path}: {e}")
+
+    def _flush_access(self) -> None:
+        """Write the access times of the entries read since the last flush, without committing."""
+        if self._pending_access:
+            self._conn.executemany(
+                "UPDATE cache SET accessed_at = ? WHERE key = ?",
+                [(accessed_at, key) for key, accessed_at in self._pending_access.items()],
+            )
+            self._pending_access.clear()
+
+    def _evict(self) -> None:
+        """Drop expired rows, then the least recently used ones over the size limit."""
+        self._flush_access()
+        if self.ttl is not None:
+            self._conn.execute("DELETE FROM cache WHERE created_at < ?", (time.time() - self.ttl * 2,))
+
+        count = self._conn.execute("SELECT COUNT(*) FROM cache").fetchone()[0]
+        if count > self.max_entries:
+            self._conn.execute(
+                "DELETE FROM cache WHERE key IN (SELECT key FROM cache ORDER BY accessed_at ASC LIMIT ?)",
+                (count - self.max_entries,),
+            )
+
+
+class TTLCache:
+    """
+    Thread-safe in-memory LRU cache with per-entry expiry.
+
+    An optional SQLiteCache can be given as a second, on-disk layer: misses
+    in memory fall through to it, and writes go to both layers.
+    """
+    def __init__(self, maxsize: int = 256, ttl: float = None, disk: SQLiteCache = None):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.disk = disk
+        self.hits = 0
+        self.misses = 0
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, default=None):
+        """
+        Get a value from the cache.
+
+        Args:
+            key: The cache key.
+            default: Returned when the key is missing or expired.
+        """
+        now = time.monotonic()
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is not None:
+                value, expires_at = entry
+                if expires_at is None or expires_at > now:
+                    self._data.move_to_end(key)
+                    self.hits += 1
+                    return value
+                del self._data[key]
+
+        if self.disk is not None:
+            value, age = self.disk.get_with_age(str(key))
+            if value is not _MISSING and (self.disk.ttl is None or age <= self.disk.ttl):
+                # Only for what is left of the TTL, the entry may have aged on disk
+                ttl = max(0, self.ttl - age) if self.ttl is not None else None
+                self._store(key, value, ttl)
+                with self._lock:
+                    self.hits += 1
+                return value
+
+        with self._lock:
+            self.misses += 1
+        return default
+
+    def set(self, key, value, ttl: float = None) -> None:
+        """
+        Store a value in the cache.
+
+        Args:
+            key: The cache key.
+            value: The value to store.
+            ttl (float): Overrides the cache TTL for this entry.
+        """
+        self._store(key, value, ttl if ttl is not None else self.ttl)
+        if self.disk is not None:
+            self.disk.set(str(key), value)
+
+    def delete(self, key) -> None:
+        with self._lock:
+            self._data.pop(key, None)
+        if self.disk is not None:
+            self.disk.delete(str(key))
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+            self.hits = 0
+            self.misses = 0
+        if self.disk is not None:
+            self.disk.clear()
+
+    def __contains__(self, key) -> bool:
+        with self._lock:
+            entry = self._data.get(key)
+            return entry is not None and (entry[1] is None or entry[1] > time.monotonic())
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._data)
+
+    def stats(self) -> dict:
+        """Get the hit/miss counters of the cache."""
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / total if total else 0.0,
+                "size": len(self._data),
+                "maxsize": self.maxsize,
+            }
+
+    def _store(self, key, value, ttl: float = None) -> None:
+        expires_at = time.monotonic() + ttl if ttl is not None else None
+        with self._lock:
+            self._data[key] = (value, expires_at)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
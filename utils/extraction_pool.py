@@ -0,0 +1,123 @@
+import os
+import logging
+import threading
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+
+logger = logging.getLogger(__name__)
+
+EXTRACTION_POOL_SIZE = 2
+EXTRACTION_POOL_MAX_TASKS_PER_CHILD = 50
+
+# Backends built inside a worker process, keyed by name
+_worker_services = {}
+
+
+def _init_worker() -> None:
+    """Set up a worker process and import the extractors up front, so the first task runs warm."""
+    # Append, the parent opens dev.log with filemode='w' in main.py's __main__ block, which spawned workers skip
+    logging.basicConfig(
+        filename="dev.log",
+        level=logging.DEBUG,
+        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+        filemode='a'
+    )
+    import pytubefix
+    import yt_dlp
+
+
+def _warm_up() -> int:
+    return os.getpid()
+
+
+def _get_worker_service(backend: str):
+    """Get a backend that runs in this worker process, building it on first use."""
+    if backend not in _worker_services:
+        from utils.youtube import YoutubeServicePyTube, YoutubeServiceYTDLP
+
+        service_classes = {
+            "pytube": YoutubeServicePyTube,
+            "ytdlp": YoutubeServiceYTDLP,
+        }
+        _worker_services[backend] = service_classes[backend]()
+    return _worker_services[backend]
+
+
+def resolve_audio_url(backend: str, video_id: str) -> str:
+    """
+    Resolve the audio URL of a video inside a worker process.
+
+    Args:
+        backend (str): "pytube" or "ytdlp".
+        video_id (str): The ID of the YouTube video.
+
+    Returns:
+        str: The direct audio stream URL for the video.
+    """
+    return _get_worker_service(backend).get_video_audio_url(video_id)
+
+
+def hydrate_video(watch_url: str):
+    """
+    Fetch the full metadata of a pytubefix search result inside a worker process.
+
+    Args:
+        watch_url (str): The watch URL of the video.
+
+    Returns:
+        YoutubeVideo: The video object, pickled back to the parent without its description.
+    """
+    return _get_worker_service("pytube")._hydrate_video(watch_url)
+
+
+class ExtractionProcessPool:
+    """
+    Warm worker processes for CPU-heavy stream extraction.
+
+    Signature and n-parameter deciphering hold the GIL for long stretches, so
+    running them in a thread still makes the UI stutter. Tasks sent here run in
+    separate processes and only return plain serializable values. Workers are
+    recycled after `max_tasks_per_child` tasks.
+    """
+    def __init__(self, max_workers: int = EXTRACTION_POOL_SIZE,
+                 max_tasks_per_child: int = EXTRACTION_POOL_MAX_TASKS_PER_CHILD):
+        self.max_workers = max_workers
+        self.max_tasks_per_child = max_tasks_per_child
+        self._executor = None
+        self._lock = threading.Lock()
+
+    @property
+    def executor(self) -> ProcessPoolExecutor:
+        """The process pool, started and warmed up on first use."""
+        with self._lock:
+            if self._executor is None:
+                # spawn, forking a process that already runs threads is not safe
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.max_workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                    initializer=_init_worker,
+                    max_tasks_per_child=self.max_tasks_per_child,
+                )
+                for _ in range(self.max_workers):
+                    self._executor.submit(_warm_up)
+            return self._executor
+
+    def submit(self, fn, *args):
+        """
+        Run a module-level function in a worker process.
+
+        Returns:
+            concurrent.futures.Future: The future of the result.
+        """
+        return self.executor.submit(fn, *args)
+
+    def run(self, fn, *args, timeout: float = None):
+        """Run a module-level function in a worker process and wait for its result."""
+        return self.submit(fn, *args).result(timeout=timeout)
+
+    def shutdown(self) -> None:
+        """Stop the worker processes, cancelling the tasks that have not started."""
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=False, cancel_futures=True)
+                self._executor = None
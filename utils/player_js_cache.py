@@ -0,0 +1,255 @@
+import os
+import re
+import json
+import time
+import logging
+import tempfile
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from utils.cache import get_cache_dir
+
+logger = logging.getLogger(__name__)
+
+PLAYER_JS_CACHE_MAX_ENTRIES = 4
+PLAYER_VERSION_PATTERN = re.compile(r"/s/player/([^/]+)/")
+
+
+def get_player_version(js_url: str) -> str:
+    """
+    Get the player version from a player JS URL such as /s/player/<version>/.../base.js.
+
+    Returns:
+        str: The version, or an empty string if the URL does not contain one.
+    """
+    match = PLAYER_VERSION_PATTERN.search(js_url or "")
+    return match.group(1) if match else ""
+
+
+class PlayerJSCache:
+    """
+    On-disk cache of YouTube player JavaScript, keyed by player version.
+
+    Extractors download and parse the player JS before they can decipher
+    stream URLs. Keeping it on disk lets worker processes and new app launches
+    skip that download. Entries live in namespaces ("pytubefix", "ytdlp") since
+    each extractor keys its copy differently, and only the newest
+    `max_entries` per namespace are kept.
+
+    Several extraction worker processes share the directory. Files are
+    written to a temp file and moved into place with os.replace, and the
+    read-modify-write of the index runs under an exclusive lock on
+    index.lock.
+    """
+    def __init__(self, directory=None, max_entries: int = PLAYER_JS_CACHE_MAX_ENTRIES):
+        self.directory = Path(directory or get_cache_dir() / "player_js")
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.max_entries = max_entries
+        self._index_path = self.directory / "index.json"
+        self._lock_path = self.directory / "index.lock"
+        self._lock = threading.Lock()
+
+    def load(self, namespace: str, key: str) -> str:
+        """
+        Load a cached player JS.
+
+        Returns:
+            str: The JS source, or None when it is not cached.
+        """
+        path = self._path(namespace, key)
+        try:
+            return path.read_text(encoding="utf-8")
+        except OSError:
+            return None
+
+    def store(self, namespace: str, key: str, js: str, url: str = None) -> None:
+        """
+        Store a player JS, dropping the oldest entries of the namespace.
+
+        Args:
+            namespace (str): The extractor the entry belongs to.
+            key (str): The player version, or the extractor's own cache key.
+            js (str): The JS source.
+            url (str): The URL the JS was downloaded from.
+        """
+        try:
+            with self._index_lock():
+                self._store_locked(namespace, key, js, url)
+        except OSError as e:
+            logger.error(f"Error locking player JS index: {e}")
+
+    def _store_locked(self, namespace: str, key: str, js: str, url: str) -> None:
+        index = self._read_index()
+        entry_id = f"{namespace}:{key}"
+        if entry_id in index:
+            return
+
+        try:
+            self._write_file(self._path(namespace, key), js)
+        except OSError as e:
+            logger.error(f"Error caching player JS {entry_id}: {e}")
+            return
+
+        index[entry_id] = {"namespace": namespace, "key": key, "url": url, "stored_at": time.time()}
+
+        entries = sorted(
+            (entry for entry in index.values() if entry["namespace"] == namespace),
+            key=lambda entry: entry["stored_at"],
+            reverse=True,
+        )
+        for entry in entries[self.max_entries:]:
+            index.pop(f"{namespace}:{entry['key']}", None)
+            self._path(namespace, entry["key"]).unlink(missing_ok=True)
+
+        self._write_index(index)
+
+    def entries(self, namespace: str) -> list:
+        """
+        Get the cached entries of a namespace, newest first.
+
+        Returns:
+            list: Dicts with the key and url of each entry.
+        """
+        with self._lock:
+            index = self._read_index()
+        return sorted(
+            (entry for entry in index.values() if entry["namespace"] == namespace),
+            key=lambda entry: entry["stored_at"],
+            reverse=True,
+        )
+
+    @contextmanager
+    def _index_lock(self):
+        """Hold the index lock of this process and the exclusive lock on index.lock shared with other processes."""
+        with self._lock, open(self._lock_path, "a+b") as lock_file:
+            if os.name == "nt":
+                import msvcrt
+
+                lock_file.seek(0)
+                msvcrt.locking(lock_file.fileno(), msvcrt.LK_LOCK, 1)
+                try:
+                    yield
+                finally:
+                    lock_file.seek(0)
+                    msvcrt.locking(lock_file.fileno(), msvcrt.LK_UNLCK, 1)
+            else:
+                import fcntl
+
+                fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX)
+                try:
+                    yield
+                finally:
+                    fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+
+    def _write_file(self, path: Path, text: str) -> None:
+        """Write a file through a temp file, so readers never see it half written."""
+        fd, temp_path = tempfile.mkstemp(dir=self.directory, prefix=f".{path.name}.", suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as temp_file:
+                temp_file.write(text)
+            os.replace(temp_path, path)
+        except OSError:
+            Path(temp_path).unlink(missing_ok=True)
+            raise
+
+    def _path(self, namespace: str, key: str) -> Path:
+        safe_key = re.sub(r"[^A-Za-z0-9_.-]", "_", key)
+        return self.directory / f"{namespace}-{safe_key}.js"
+
+    def _read_index(self) -> dict:
+        try:
+            return json.loads(self._index_path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return {}
+
+    def _write_index(self, index: dict) -> None:
+        try:
+            self._write_file(self._index_path, json.dumps(index))
+        except OSError as e:
+            logger.error(f"Error writing player JS index: {e}")
+
+
+_player_js_cache = None
+_player_js_cache_lock = threading.Lock()
+# yt-dlp code cache keys this process already loaded from or wrote to disk
+_persisted_ytdlp_keys = set()
+
+
+def get_player_js_cache() -> PlayerJSCache:
+    """Get the process-wide player JS cache."""
+    global _player_js_cache
+    with _player_js_cache_lock:
+        if _player_js_cache is None:
+            _player_js_cache = PlayerJSCache()
+        return _player_js_cache
+
+
+def restore_pytubefix_player() -> None:
+    """
+    Seed pytubefix's in-process player JS cache with the newest copy on disk.
+
+    pytubefix only re-downloads the JS when a video's js_url differs from the
+    seeded one, so a matching player version skips the download entirely.
+    """
+    import pytubefix
+
+    if pytubefix.__js__ is not None:
+        return
+
+    for entry in get_player_js_cache().entries("pytubefix"):
+        js = get_player_js_cache().load("pytubefix", entry["key"])
+        if js and entry["url"]:
+            pytubefix.__js__ = js
+            pytubefix.__js_url__ = entry["url"]
+            return
+
+
+def save_pytubefix_player() -> None:
+    """Persist the player JS pytubefix currently holds in memory."""
+    import pytubefix
+
+    version = get_player_version(pytubefix.__js_url__)
+    if pytubefix.__js__ and version:
+        get_player_js_cache().store("pytubefix", version, pytubefix.__js__, url=pytubefix.__js_url__)
+
+
+def _get_ytdlp_youtube_extractor(ydl):
+    try:
+        return ydl.get_info_extractor("Youtube")
+    except Exception as e:
+        logger.error(f"Error getting the yt-dlp YouTube extractor: {e}")
+        return None
+
+
+def restore_ytdlp_player(ydl) -> None:
+    """
+    Seed the player JS cache of a YoutubeDL's YouTube extractor from disk.
+
+    Relies on the extractor's in-memory `_code_cache`, keyed like yt-dlp's own
+    player cache. Deciphered signature and n-functions are cached by yt-dlp
+    itself under its `cachedir`.
+    """
+    extractor = _get_ytdlp_youtube_extractor(ydl)
+    code_cache = getattr(extractor, "_code_cache", None)
+    if code_cache is None:
+        return
+
+    for entry in get_player_js_cache().entries("ytdlp"):
+        if entry["key"] not in code_cache:
+            js = get_player_js_cache().load("ytdlp", entry["key"])
+            if js:
+                code_cache[entry["key"]] = js
+                _persisted_ytdlp_keys.add(entry["key"])
+
+
+def save_ytdlp_player(ydl) -> None:
+    """Persist the player JS a YoutubeDL's YouTube extractor has downloaded, only the entries not on disk yet."""
+    extractor = _get_ytdlp_youtube_extractor(ydl)
+    code_cache = getattr(extractor, "_code_cache", None)
+    if not code_cache:
+        return
+
+    for key, js in list(code_cache.items()):
+        if key not in _persisted_ytdlp_keys:
+            get_player_js_cache().store("ytdlp", key, js)
+            _persisted_ytdlp_keys.add(key)
@@ -0,0 +1,109 @@
+import re
+import logging
+import xml.etree.ElementTree as ElementTree
+from urllib.parse import quote
+
+logger = logging.getLogger(__name__)
+
+PLS_FILE_PATTERN = re.compile(r"^\s*File(\d+)\s*=\s*(.+?)\s*$", re.IGNORECASE | re.MULTILINE)
+STREAM_URL_PATTERN = re.compile(r"^[a-z][a-z0-9+.-]*://", re.IGNORECASE)
+# Characters that may appear in a URL as they are, everything else gets percent-encoded
+URL_SAFE_CHARS = ":/?#[]@!$&'()*+,;=%~"
+
+
+def normalize_stream_url(url: str) -> str:
+    """
+    Percent-encode the characters of a stream URL that are not allowed in URLs, such as spaces.
+
+    Returns:
+        str: The URL, or an empty string if it is not an absolute URL.
+    """
+    url = url.strip()
+    if not STREAM_URL_PATTERN.match(url):
+        return ''
+    return quote(url, safe=URL_SAFE_CHARS)
+
+
+def parse_pls(text: str) -> list:
+    """
+    Parse a PLS playlist.
+
+    Args:
+        text (str): The playlist content.
+
+    Returns:
+        list: The stream URLs, ordered by their FileN number.
+    """
+    entries = sorted((int(number), url) for number, url in PLS_FILE_PATTERN.findall(text))
+    return [url for _, url in entries]
+
+
+def parse_m3u(text: str) -> list:
+    """
+    Parse an M3U or extended M3U playlist.
+
+    Args:
+        text (str): The playlist content.
+
+    Returns:
+        list: The stream URLs, in playlist order.
+    """
+    return [line.strip() for line in text.splitlines() if line.strip() and not line.strip().startswith("#")]
+
+
+def parse_xspf(text: str) -> list:
+    """
+    Parse an XSPF playlist.
+
+    Args:
+        text (str): The playlist content.
+
+    Returns:
+        list: The stream URLs of the track locations, in playlist order.
+    """
+    try:
+        root = ElementTree.fromstring(text)
+    except ElementTree.ParseError as e:
+        logger.error(f"Error parsing XSPF playlist: {e}")
+        return []
+
+    # Match <location> in any namespace, XSPF uses http://xspf.org/ns/0/
+    return [
+        element.text.strip()
+        for element in root.iter()
+        if element.tag.rsplit("}", 1)[-1] == "location" and element.text
+    ]
+
+
+def parse_playlist(text: str, playlist_format: str = None) -> list:
+    """
+    Parse a PLS, M3U or XSPF playlist into its stream URLs.
+
+    Args:
+        text (str): The playlist content.
+        playlist_format (str): "pls", "m3u" or "xspf". Detected from the content when not given.
+
+    Returns:
+        list: The unique, normalized stream URLs, in playlist order.
+    """
+    if playlist_format is None:
+        stripped = text.lstrip()
+        if stripped.startswith("<"):
+            playlist_format = "xspf"
+        elif PLS_FILE_PATTERN.search(text):
+            playlist_format = "pls"
+        else:
+            playlist_format = "m3u"
+
+    parsers = {
+        "pls": parse_pls,
+        "m3u": parse_m3u,
+        "xspf": parse_xspf,
+    }
+
+    urls = []
+    for url in parsers[playlist_format](text):
+        url = normalize_stream_url(url)
+        if url and url not in urls:
+            urls.append(url)
+    return urls
@@ -1,34 +1,136 @@
 import os
+import json
 import logging
 import asyncio
+import threading
 import httpx
 import requests
 import xmltodict
+from concurrent.futures import Future
+from requests.adapters import HTTPAdapter
 from dotenv import load_dotenv
-from urllib.parse import quote
+from utils.cache import SQLiteCache, TTLCache, get_cache_dir
+from utils.playlist import parse_playlist
+from utils.stream_prober import StreamProber
 
 load_dotenv()
 
 SHOUTCAST_BASE_URL = "http://api.shoutcast.com"
 YP_SHOUTCAST_URL = "http://yp.shoutcast.com"
 TIMEOUT_DEFAULT = 5
+POOL_MAX_CONNECTIONS = 10
+POOL_MAX_KEEPALIVE_CONNECTIONS = 5
+POOL_KEEPALIVE_EXPIRY = 30
+
+# Seconds a cached response stays fresh, per endpoint. Older entries are still
+# served, and refreshed in the background, until SHOUTCAST_CACHE_STALE_TTL.
+SHOUTCAST_CACHE_TTLS = {
+    "legacy/genrelist": 24 * 60 * 60,
+    "genre/primary": 24 * 60 * 60,
+    "genre/secondary": 24 * 60 * 60,
+    "legacy/Top500": 6 * 60 * 60,
+}
+SHOUTCAST_CACHE_STALE_TTL = 30 * 24 * 60 * 60
+SHOUTCAST_CACHE_MAX_ENTRIES = 500
+
+DEFAULT_TUNEIN = {
+    'base': '/sbin/tunein-station.pls',
+    'base-m3u': '/sbin/tunein-station.m3u',
+    'base-xspf': '/sbin/tunein-station.xspf'
+}
+# Tunein playlists in the order they are tried
+TUNEIN_PLAYLIST_FORMATS = (("base", "pls"), ("base-m3u", "m3u"), ("base-xspf", "xspf"))
+STREAM_URLS_CACHE_TTL = 10 * 60
+STREAM_URLS_CACHE_MAXSIZE = 256
 
-logging.basicConfig(
-    filename=f"dev.log",
-    level=logging.DEBUG,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    filemode='w'  # a = append, w = overwrite
-)
 logger = logging.getLogger(__name__)
 
 
 class ShoutcastRadio:
-    def __init__(self, api_key=''):
+    def __init__(self, api_key='', max_connections=POOL_MAX_CONNECTIONS,
+                 max_keepalive_connections=POOL_MAX_KEEPALIVE_CONNECTIONS,
+                 keepalive_expiry=POOL_KEEPALIVE_EXPIRY, use_cache=True):
         self.api_key = api_key or os.getenv("SHOUTCAST_API_KEY")
 
         if not self.api_key:
             raise ValueError("Shoutcast API key is required")
 
+        # Shared transport, built on first use and released by close() / aclose()
+        self.limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections,
+            keepalive_expiry=keepalive_expiry,
+        )
+        self._async_client = None
+        self._session = None
+        self._transport_lock = threading.Lock()
+
+        # In-flight requests keyed by endpoint and params, shared by identical concurrent calls
+        self._inflight_async = {}
+        self._inflight_sync = {}
+        self._inflight_lock = threading.Lock()
+
+        # Stream URLs resolved from tunein playlists, keyed by station ID
+        self.stream_urls_cache = TTLCache(maxsize=STREAM_URLS_CACHE_MAXSIZE, ttl=STREAM_URLS_CACHE_TTL)
+        # Stream URLs ordered by probing, fastest mirror first, keyed by station ID
+        self.station_streams_cache = TTLCache(maxsize=STREAM_URLS_CACHE_MAXSIZE, ttl=STREAM_URLS_CACHE_TTL)
+
+        # Responses of the endpoints in SHOUTCAST_CACHE_TTLS, kept on disk across launches
+        self.cache = None
+        self._refresh_tasks = set()
+        if use_cache:
+            try:
+                self.cache = SQLiteCache(get_cache_dir() / "shoutcast.sqlite3",
+                                         ttl=SHOUTCAST_CACHE_STALE_TTL, max_entries=SHOUTCAST_CACHE_MAX_ENTRIES)
+            except Exception as e:
+                logger.error(f"Error opening Shoutcast cache: {e}")
+
+    @property
+    def async_client(self) -> httpx.AsyncClient:
+        """
+        The long-lived async client, keeping connections alive between requests.
+        """
+        if self._async_client is None or self._async_client.is_closed:
+            self._async_client = httpx.AsyncClient(limits=self.limits, timeout=TIMEOUT_DEFAULT)
+        return self._async_client
+
+    @property
+    def session(self) -> requests.Session:
+        """
+        The long-lived sync session, keeping connections alive between requests.
+        """
+        with self._transport_lock:
+            if self._session is None:
+                adapter = HTTPAdapter(
+                    pool_connections=self.limits.max_keepalive_connections,
+                    pool_maxsize=self.limits.max_connections,
+                )
+                self._session = requests.Session()
+                self._session.mount("http://", adapter)
+                self._session.mount("https://", adapter)
+            return self._session
+
+    def close(self):
+        """
+        Close the sync session. Use aclose() to close the async client too.
+        """
+        with self._transport_lock:
+            if self._session is not None:
+                self._session.close()
+                self._session = None
+
+    async def aclose(self):
+        """
+        Close the async client and the sync session.
+        """
+        for task in list(self._refresh_tasks):
+            task.cancel()
+
+        if self._async_client is not None:
+            await self._async_client.aclose()
+            self._async_client = None
+        self.close()
+
     async def get_all_genres(self):
         """
         Get the list of all genres asynchronously.
@@ -37,9 +139,7 @@ class ShoutcastRadio:
             "k": self.api_key,
         }
 
-        response = await self._shoutcast_request_async("legacy/genrelist", params)
-
-        return self._process_genres_response(response)
+        return await self._shoutcast_fetch_async("legacy/genrelist", params, self._process_genres_response)
 
     def get_all_genres_sync(self):
         """
@@ -49,9 +149,7 @@ class ShoutcastRadio:
             "k": self.api_key,
         }
 
-        response = self._shoutcast_request_sync("legacy/genrelist", params)
-
-        return self._process_genres_response(response)
+        return self._shoutcast_fetch_sync("legacy/genrelist", params, self._process_genres_response)
 
     async def get_primary_genres(self, **kwargs):
         """
@@ -62,9 +160,7 @@ class ShoutcastRadio:
             "f": kwargs.get("format", "json"),
         }
 
-        response = await self._shoutcast_request_async("genre/primary", params)
-
-        return self._process_primary_genres_response(response)
+        return await self._shoutcast_fetch_async("genre/primary", params, self._process_primary_genres_response)
 
     def get_primary_genres_sync(self, **kwargs):
         """
@@ -75,9 +171,7 @@ class ShoutcastRadio:
             "f": kwargs.get("format", "json"),
         }
 
-        response = self._shoutcast_request_sync("genre/primary", params)
-
-        return self._process_primary_genres_response(response)
+        return self._shoutcast_fetch_sync("genre/primary", params, self._process_primary_genres_response)
 
     async def get_secondary_genres(self, **kwargs):
         """
@@ -89,9 +183,7 @@ class ShoutcastRadio:
             "parentid": kwargs.get("parentid", ""),
         }
 
-        response = await self._shoutcast_request_async("genre/secondary", params)
-
-        return self._process_primary_genres_response(response)
+        return await self._shoutcast_fetch_async("genre/secondary", params, self._process_primary_genres_response)
 
     def get_secondary_genres_sync(self, **kwargs):
         """
@@ -103,9 +195,7 @@ class ShoutcastRadio:
             "parentid": kwargs.get("parentid", ""),
         }
 
-        response = self._shoutcast_request_sync("genre/secondary", params)
-
-        return self._process_primary_genres_response(response)
+        return self._shoutcast_fetch_sync("genre/secondary", params, self._process_primary_genres_response)
 
     async def get_top_500_stations(self, **kwargs):
         """
@@ -118,9 +208,7 @@ class ShoutcastRadio:
             "f": kwargs.get("format", "json"),
         }
 
-        response = await self._shoutcast_request_async("legacy/Top500", params)
-
-        return self._process_top_stations_response(response)
+        return await self._shoutcast_fetch_async("legacy/Top500", params, self._process_top_stations_response)
 
     def get_top_500_stations_sync(self, **kwargs):
         """
@@ -133,9 +221,7 @@ class ShoutcastRadio:
             "f": kwargs.get("format", "json"),
         }
 
-        response = self._shoutcast_request_sync("legacy/Top500", params)
-
-        return self._process_top_stations_response(response)
+        return self._shoutcast_fetch_sync("legacy/Top500", params, self._process_top_stations_response)
 
     async def get_now_playing_stations(self, **kwargs):
         """
@@ -149,9 +235,7 @@ class ShoutcastRadio:
             "f": kwargs.get("format", "json"),
         }
 
-        response = await self._shoutcast_request_async("station/nowplaying", params)
-
-        return self._process_station_response(response)
+        return await self._shoutcast_fetch_async("station/nowplaying", params, self._process_station_response)
 
     def get_now_playing_stations_sync(self, **kwargs):
         """
@@ -165,9 +249,7 @@ class ShoutcastRadio:
             "f": kwargs.get("format", "json"),
         }
 
-        response = self._shoutcast_request_sync("station/nowplaying", params)
-
-        return self._process_station_response(response)
+        return self._shoutcast_fetch_sync("station/nowplaying", params, self._process_station_response)
 
     async def get_stations_by_genre_or_bitrate(self, **kwargs):
         """
@@ -182,9 +264,7 @@ class ShoutcastRadio:
             "genre_id": kwargs.get("genre_id", ""),
         }
 
-        response = await self._shoutcast_request_async("station/advancedsearch", params)
-
-        return self._process_station_response(response)
+        return await self._shoutcast_fetch_async("station/advancedsearch", params, self._process_station_response)
 
     def get_stations_by_genre_or_bitrate_sync(self, **kwargs):
         """
@@ -199,55 +279,273 @@ class ShoutcastRadio:
             "genre_id": kwargs.get("genre_id", ""),
         }
 
-        response = self._shoutcast_request_sync(
-            "station/advancedsearch", params)
+        return self._shoutcast_fetch_sync("station/advancedsearch", params, self._process_station_response)
 
-        return self._process_station_response(response)
+    async def get_station_stream_urls(self, station_id="", tunin=None, timeout=TIMEOUT_DEFAULT):
+        """
+        Get every stream URL of a station asynchronously, from its tunein playlist.
 
-    def get_station_stream_url(self, station_id="", tunin={}):
+        The PLS playlist is tried first, then M3U and XSPF. Resolved URLs are
+        cached per station for STREAM_URLS_CACHE_TTL seconds.
         """
-        Get the stream URL for a given station ID.
+        if not station_id:
+            return []
+
+        stream_urls = self.stream_urls_cache.get(str(station_id))
+        if stream_urls:
+            return stream_urls
+
+        for tunein_url, playlist_format in self._get_tunein_urls(station_id, tunin):
+            try:
+                response = await self.async_client.get(tunein_url, timeout=timeout, follow_redirects=True)
+                response.raise_for_status()
+            except httpx.HTTPError as e:
+                logger.error(f"Error fetching tunein playlist {tunein_url}: {e}")
+                continue
+
+            stream_urls = self._process_tunein_response(station_id, response.text, playlist_format)
+            if stream_urls:
+                return stream_urls
+
+        return []
+
+    def get_station_stream_urls_sync(self, station_id="", tunin=None, timeout=TIMEOUT_DEFAULT):
+        """
+        Get every stream URL of a station synchronously, see get_station_stream_urls.
         """
-        if station_id == "":
-            return ''
+        if not station_id:
+            return []
 
-        if not tunin:
-            tunin = {
-                'base': '/sbin/tunein-station.pls',
-                'base-m3u': '/sbin/tunein-station.m3u',
-                'base-xspf': '/sbin/tunein-station.xspf'
-            }
+        stream_urls = self.stream_urls_cache.get(str(station_id))
+        if stream_urls:
+            return stream_urls
+
+        for tunein_url, playlist_format in self._get_tunein_urls(station_id, tunin):
+            try:
+                response = self.session.get(tunein_url, timeout=timeout)
+                response.raise_for_status()
+            except requests.exceptions.RequestException as e:
+                logger.error(f"Error fetching tunein playlist {tunein_url}: {e}")
+                continue
+
+            stream_urls = self._process_tunein_response(station_id, response.text, playlist_format)
+            if stream_urls:
+                return stream_urls
+
+        return []
+
+    async def get_station_streams(self, station_id="", tunin=None, timeout=TIMEOUT_DEFAULT):
+        """
+        Get the working stream URLs of a station, fastest mirror first.
+
+        Every candidate of the tunein playlist is probed at once. The first one
+        to send audio wins and the others follow as fallbacks, dead mirrors
+        are left out. The order is remembered per station. When no candidate
+        answers the probe, they are all returned in playlist order.
+        """
+        station_key = str(station_id)
+        stream_urls = self.station_streams_cache.get(station_key)
+        if stream_urls:
+            return stream_urls
+
+        candidates = await self.get_station_stream_urls(station_id, tunin, timeout)
+        if not candidates:
+            return []
+
+        probes = await StreamProber(self.async_client, timeout=timeout).race(candidates)
+        stream_urls = [probe["url"] for probe in probes]
+        if not stream_urls:
+            # No probe answered in time, which says more about the probe than the mirrors,
+            # let the player try them in playlist order and probe again next time
+            logger.warning(f"No stream of station {station_id} answered the probe, using the playlist order")
+            return candidates
+
+        self.station_streams_cache.set(station_key, stream_urls)
+        return stream_urls
+
+    def forget_station_streams(self, station_id):
+        """
+        Drop the remembered streams of a station, e.g. after none of them could be played.
+        """
+        self.station_streams_cache.delete(str(station_id))
+        self.stream_urls_cache.delete(str(station_id))
 
-        tunin_base = tunin.get("base", "") or tunin.get("@base", "")
-        # tunin_base_m3u = tunin.get("base-m3u", "") or tunin.get("@base-m3u", "")
-        # tunin_base_xspf = tunin.get("base-xspf", "") or tunin.get("@base-xspf", "")
+    def get_station_stream_url(self, station_id="", tunin=None):
+        """
+        Get the first stream URL for a given station ID.
+        """
+        stream_urls = self.get_station_stream_urls_sync(station_id, tunin)
+        return stream_urls[0] if stream_urls else ''
+
+    def _get_tunein_urls(self, station_id, tunin=None):
+        """
+        Build the tunein playlist URLs of a station, with the format of each.
+        """
+        tunin = tunin or DEFAULT_TUNEIN
+
+        tunein_urls = []
+        for key, playlist_format in TUNEIN_PLAYLIST_FORMATS:
+            tunin_base = tunin.get(key, "") or tunin.get(f"@{key}", "")
+            if tunin_base:
+                tunein_urls.append((f"{YP_SHOUTCAST_URL}/{tunin_base.lstrip('/')}?id={station_id}", playlist_format))
+        return tunein_urls
+
+    def _process_tunein_response(self, station_id, text, playlist_format):
+        """
+        Helper method to parse a tunein playlist and cache its stream URLs.
+        """
+        stream_urls = parse_playlist(text, playlist_format)
+        if stream_urls:
+            self.stream_urls_cache.set(str(station_id), stream_urls)
+        return stream_urls
+
+    def _request_key(self, endpoint, params):
+        """
+        Build the key identifying a request, from its endpoint and params.
+        """
+        return endpoint, tuple(sorted((key, str(value)) for key, value in params.items()))
+
+    def _cache_key(self, endpoint, params):
+        """
+        Build the cache key of a request, leaving the API key out.
+        """
+        return json.dumps(self._request_key(endpoint, {key: value for key, value in params.items() if key != "k"}))
+
+    def _get_cached(self, endpoint, params):
+        """
+        Get a cached processed response, regardless of its age.
+
+        Returns:
+            tuple: The value and whether it is stale, or (None, False) when nothing is cached.
+        """
+        ttl = SHOUTCAST_CACHE_TTLS.get(endpoint)
+        if ttl is None or self.cache is None:
+            return None, False
+
+        value, age = self.cache.get_with_age(self._cache_key(endpoint, params))
+        if age is None or age > self.cache.ttl:
+            return None, False
+        return value, age > ttl
+
+    def _set_cached(self, endpoint, params, value):
+        # Empty results are not cached, they would hide the data for a whole TTL
+        if value and endpoint in SHOUTCAST_CACHE_TTLS and self.cache is not None:
+            self.cache.set(self._cache_key(endpoint, params), value)
 
-        tunin_base_url = f"{YP_SHOUTCAST_URL}/{tunin_base}?id={station_id}"
-        # tunin_base_m3u_url = f"{YP_SHOUTCAST_URL}/{tunin_base_m3u}?id={station_id}"
-        # tunin_base_xspf_url = f"{YP_SHOUTCAST_URL}/{tunin_base_xspf}?id={station_id}"
+    async def _shoutcast_fetch_async(self, endpoint, params, process):
+        """
+        Get a processed response asynchronously, from the cache when possible.
+
+        Stale cache entries are returned right away and refreshed in the background.
+        """
+        value, is_stale = self._get_cached(endpoint, params)
+        if value is None:
+            return await self._shoutcast_fetch_shared_async(endpoint, params, process)
+
+        if is_stale:
+            task = asyncio.ensure_future(self._shoutcast_fetch_shared_async(endpoint, params, process))
+            self._refresh_tasks.add(task)
 
-        tunin_response = requests.get(tunin_base_url)
+            def forget(done_task):
+                self._refresh_tasks.discard(done_task)
+                if not done_task.cancelled() and done_task.exception():
+                    logger.error(f"Error refreshing {endpoint}: {done_task.exception()}")
 
-        if tunin_response.status_code != 200:
-            return ''
+            task.add_done_callback(forget)
+        return value
+
+    def _shoutcast_fetch_sync(self, endpoint, params, process):
+        """
+        Get a processed response synchronously, from the cache when possible.
+
+        Stale cache entries are returned right away and refreshed in a background thread.
+        """
+        value, is_stale = self._get_cached(endpoint, params)
+        if value is None:
+            return self._shoutcast_fetch_shared_sync(endpoint, params, process)
+
+        if is_stale:
+            def refresh():
+                try:
+                    self._shoutcast_fetch_shared_sync(endpoint, params, process)
+                except Exception as e:
+                    logger.error(f"Error refreshing {endpoint}: {e}")
+
+            threading.Thread(target=refresh, daemon=True).start()
+        return value
+
+    async def _shoutcast_fetch_shared_async(self, endpoint, params, process):
+        """
+        Request an endpoint and process the response, asynchronously.
+
+        Identical concurrent calls share one in-flight request and its
+        processed result. A cancelled caller does not cancel the request for
+        the others.
+        """
+        key = self._request_key(endpoint, params)
+        task = self._inflight_async.get(key)
+
+        if task is None:
+            async def fetch():
+                response = await self._shoutcast_request_async(endpoint, params)
+                value = process(response)
+                self._set_cached(endpoint, params, value)
+                return value
+
+            task = asyncio.ensure_future(fetch())
+            self._inflight_async[key] = task
+
+            def forget(done_task):
+                if self._inflight_async.get(key) is done_task:
+                    del self._inflight_async[key]
+                # Nobody may be left to await the result
+                if not done_task.cancelled():
+                    done_task.exception()
+
+            task.add_done_callback(forget)
+        else:
+            logger.debug(f"Joining in-flight request {endpoint}")
+
+        return await asyncio.shield(task)
+
+    def _shoutcast_fetch_shared_sync(self, endpoint, params, process):
+        """
+        Request an endpoint and process the response, synchronously.
+
+        Identical concurrent calls from other threads wait for the first one
+        and share its processed result.
+        """
+        key = self._request_key(endpoint, params)
+
+        with self._inflight_lock:
+            future = self._inflight_sync.get(key)
+            is_leader = future is None
+            if is_leader:
+                future = Future()
+                self._inflight_sync[key] = future
+
+        if not is_leader:
+            logger.debug(f"Joining in-flight request {endpoint}")
+            return future.result()
 
         try:
-            tunin_content_data = tunin_response.content
-            stream_url = tunin_content_data.decode("utf-8").strip()
-            stream_url = stream_url.split("File1=")[1].split("Title1")[0]
-            stream_url = quote(stream_url, safe=":/")
+            value = process(self._shoutcast_request_sync(endpoint, params))
+            self._set_cached(endpoint, params, value)
+            future.set_result(value)
         except Exception as e:
-            print(f"Error parsing stream URL: {e}")
-            return ''
+            future.set_exception(e)
+        finally:
+            with self._inflight_lock:
+                del self._inflight_sync[key]
 
-        return stream_url
+        return future.result()
 
     def _shoutcast_request_sync(self, endpoint, params):
         """
         Helper function to make a GET request to the Shoutcast API synchronously.
         """
         try:
-            response = requests.get(
+            response = self.session.get(
                 f"{SHOUTCAST_BASE_URL}/{endpoint}", params=params, timeout=TIMEOUT_DEFAULT)
             response.raise_for_status()
         except requests.exceptions.Timeout:
@@ -267,16 +565,15 @@ class ShoutcastRadio:
         """
         Helper function to make a GET request to the Shoutcast API asynchronously.
         """
-        async with httpx.AsyncClient() as client:
-            try:
-                response = await client.get(f"{SHOUTCAST_BASE_URL}/{endpoint}", params=params, timeout=TIMEOUT_DEFAULT)
-                response.raise_for_status()
-            except httpx.TimeoutException:
-                raise Exception("Request timed out. Please try again later.")
-            except httpx.RequestError as e:
-                raise Exception(f"Error fetching data: {e}")
-            except Exception as e:
-                raise Exception(f"An unexpected error occurred: {e}")
+        try:
+            response = await self.async_client.get(f"{SHOUTCAST_BASE_URL}/{endpoint}", params=params, timeout=TIMEOUT_DEFAULT)
+            response.raise_for_status()
+        except httpx.TimeoutException:
+            raise Exception("Request timed out. Please try again later.")
+        except httpx.RequestError as e:
+            raise Exception(f"Error fetching data: {e}")
+        except Exception as e:
+            raise Exception(f"An unexpected error occurred: {e}")
 
         if response.status_code != 200:
             raise Exception(
@@ -365,6 +662,7 @@ async def main():
     radio = ShoutcastRadio()
     genres = await radio.get_stations_by_genre_or_bitrate(genre_id="1")
     print("Asynchronous Call - Genres:", genres)
+    await radio.aclose()
 
 if __name__ == "__main__":
     # Run example
@@ -0,0 +1,161 @@
+import time
+import asyncio
+import logging
+import httpx
+from urllib.parse import urlsplit
+
+logger = logging.getLogger(__name__)
+
+STREAM_PROBE_TIMEOUT = 5
+# Asks Shoutcast/Icecast servers for their icy-* headers
+ICY_REQUEST_HEADERS = {"Icy-MetaData": "1"}
+
+
+class RedirectError(Exception):
+    """Raised by the socket probe when a stream redirects, the httpx client follows those."""
+
+
+class StreamProber:
+    """
+    Open stream URLs and measure how fast they start sending audio.
+
+    A probe records the time to the response headers (including the ICY
+    headers) and to the first audio bytes, then closes the connection.
+    Plain http:// streams are probed over a socket, since Shoutcast v1
+    servers answer with an "ICY 200 OK" status line that httpx rejects.
+    https:// streams and redirects go through the httpx client.
+    """
+    def __init__(self, client: httpx.AsyncClient, timeout: float = STREAM_PROBE_TIMEOUT):
+        self.client = client
+        self.timeout = timeout
+
+    async def probe(self, url: str) -> dict:
+        """
+        Probe a single stream URL.
+
+        Args:
+            url (str): The stream URL.
+
+        Returns:
+            dict: The url, headers_time and first_bytes_time in seconds, the icy-* headers and the content type.
+
+        Raises:
+            Exception: If the stream does not answer with audio within the timeout.
+        """
+        return await asyncio.wait_for(self._probe(url), timeout=self.timeout)
+
+    async def _probe(self, url: str) -> dict:
+        if urlsplit(url).scheme == "http":
+            try:
+                return await self._probe_socket(url)
+            except RedirectError:
+                pass
+        return await self._probe_http(url)
+
+    async def _probe_http(self, url: str) -> dict:
+        started_at = time.monotonic()
+        async with self.client.stream("GET", url, headers=ICY_REQUEST_HEADERS,
+                                      timeout=self.timeout, follow_redirects=True) as response:
+            headers_time = time.monotonic() - started_at
+            response.raise_for_status()
+
+            async for chunk in response.aiter_raw():
+                if chunk:
+                    break
+            else:
+                raise RuntimeError("Stream ended before sending any audio")
+
+            return self._build_probe(url, headers_time, time.monotonic() - started_at, response.headers)
+
+    async def _probe_socket(self, url: str) -> dict:
+        """Probe a plain http:// stream over a socket, accepting both ICY and HTTP status lines."""
+        started_at = time.monotonic()
+        parts = urlsplit(url)
+        path = parts.path or "/"
+        if parts.query:
+            path = f"{path}?{parts.query}"
+
+        reader, writer = await asyncio.open_connection(parts.hostname, parts.port or 80)
+        try:
+            user_agent = self.client.headers.get("user-agent", "")
+            writer.write(
+                f"GET {path} HTTP/1.0\r\nHost: {parts.netloc}\r\nIcy-MetaData: 1\r\n"
+                f"User-Agent: {user_agent}\r\n\r\n".encode()
+            )
+            await writer.drain()
+
+            status_line = (await reader.readline()).decode("latin-1").split()
+            if len(status_line) >= 2 and status_line[1].startswith("3"):
+                raise RedirectError(url)
+            if len(status_line) < 2 or status_line[1] != "200":
+                raise RuntimeError(f"Stream answered {' '.join(status_line) or 'nothing'}")
+
+            headers = {}
+            while True:
+                line = (await reader.readline()).decode("latin-1").strip()
+                if not line:
+                    break
+                name, _, value = line.partition(":")
+                headers[name.strip().lower()] = value.strip()
+            headers_time = time.monotonic() - started_at
+
+            if not await reader.read(1):
+                raise RuntimeError("Stream ended before sending any audio")
+
+            return self._build_probe(url, headers_time, time.monotonic() - started_at, headers)
+        finally:
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except OSError:
+                pass
+
+    def _build_probe(self, url: str, headers_time: float, first_bytes_time: float, headers) -> dict:
+        return {
+            "url": url,
+            "headers_time": headers_time,
+            "first_bytes_time": first_bytes_time,
+            "icy": {name.lower(): value for name, value in headers.items() if name.lower().startswith("icy-")},
+            "content_type": headers.get("content-type", ""),
+        }
+
+    async def race(self, urls: list) -> list:
+        """
+        Probe every URL at once and stop as soon as one of them sends audio.
+
+        Args:
+            urls (list): The candidate stream URLs, in playlist order.
+
+        Returns:
+            list: Probe dicts, the winner first, then the other URLs that answered,
+            fastest first, then the URLs still being probed in playlist order with
+            None timings. URLs that failed are left out.
+        """
+        tasks = {asyncio.ensure_future(self.probe(url)): url for url in urls}
+        pending = set(tasks)
+        answered = []
+
+        try:
+            while pending and not answered:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    try:
+                        answered.append(task.result())
+                    except Exception as e:
+                        logger.warning(f"Stream {tasks[task]} failed its probe: {e!r}")
+        finally:
+            # Losers are cut off right away, each open probe holds a live stream
+            for task in pending:
+                task.cancel()
+            await asyncio.gather(*pending, return_exceptions=True)
+
+        answered.sort(key=lambda probe: probe["first_bytes_time"])
+        unfinished = [
+            {"url": url, "headers_time": None, "first_bytes_time": None, "icy": {}, "content_type": ""}
+            for task, url in tasks.items() if task in pending
+        ]
+
+        for probe in answered:
+            logger.debug(f"Stream {probe['url']} headers in {probe['headers_time']:.3f}s, "
+                         f"audio in {probe['first_bytes_time']:.3f}s, {probe['icy'].get('icy-name', '')}")
+        return answered + unfinished
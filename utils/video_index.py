@@ -0,0 +1,205 @@
+import re
+import time
+import sqlite3
+import logging
+import threading
+from utils.cache import get_cache_dir
+from utils.youtube_video import YoutubeVideo
+
+logger = logging.getLogger(__name__)
+
+VIDEO_INDEX_MAX_ENTRIES = 20000
+VIDEO_INDEX_SEARCH_LIMIT = 20
+# Descriptions are only indexed up to this many characters
+VIDEO_INDEX_DESCRIPTION_LENGTH = 1000
+WORD_PATTERN = re.compile(r"\w+", re.UNICODE)
+
+
+def video_matches_query(video, query: str) -> bool:
+    """
+    Check whether every word of a query starts a word of a video's title or channel.
+
+    Args:
+        video (YoutubeVideo): The video.
+        query (str): The search query.
+
+    Returns:
+        bool: True if the video matches.
+    """
+    video_words = WORD_PATTERN.findall(f"{video.title} {video.channel_title}".lower())
+    return all(
+        any(video_word.startswith(word) for video_word in video_words)
+        for word in WORD_PATTERN.findall(query.lower())
+    )
+
+
+class VideoIndex:
+    """
+    Local full-text index of the videos seen in search results.
+
+    Title, channel and description are indexed with SQLite FTS5 when the
+    SQLite build has it, otherwise searches fall back to LIKE matching. The
+    index keeps at most `max_entries` videos and evicts the ones that were
+    least recently seen or matched.
+    """
+    def __init__(self, path=None, max_entries: int = VIDEO_INDEX_MAX_ENTRIES):
+        self.path = str(path or get_cache_dir() / "youtube_video_index.sqlite3")
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS videos ("
+            "id INTEGER PRIMARY KEY, video_id TEXT NOT NULL UNIQUE, "
+            "title TEXT NOT NULL, channel_title TEXT NOT NULL, channel_id TEXT NOT NULL, "
+            "description TEXT NOT NULL, views INTEGER NOT NULL, length INTEGER NOT NULL, "
+            "accessed_at REAL NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS videos_accessed_at ON videos (accessed_at)")
+        self.has_fts = self._create_fts_table()
+        self._conn.commit()
+
+    def _create_fts_table(self) -> bool:
+        try:
+            self._conn.execute(
+                "CREATE VIRTUAL TABLE IF NOT EXISTS videos_fts USING fts5("
+                "title, channel_title, description, tokenize='unicode61 remove_diacritics 2')"
+            )
+            return True
+        except sqlite3.OperationalError as e:
+            logger.warning(f"SQLite has no FTS5, the video index falls back to LIKE searches: {e}")
+            return False
+
+    def add(self, videos: list) -> None:
+        """
+        Index videos, updating the ones that are already known.
+
+        A known description, title and channel are kept when the new record
+        has none, e.g. a partial record that only knows the video ID.
+
+        Args:
+            videos (list): The YoutubeVideo objects to index.
+        """
+        now = time.time()
+        with self._lock:
+            try:
+                for video in videos:
+                    self._upsert(video, now)
+                self._evict()
+                self._conn.commit()
+            except sqlite3.Error as e:
+                self._conn.rollback()
+                logger.error(f"Error indexing videos: {e}")
+
+    def _upsert(self, video: YoutubeVideo, now: float) -> None:
+        description = (video.loaded_description or "")[:VIDEO_INDEX_DESCRIPTION_LENGTH]
+        title, channel_title, channel_id = video.title, video.channel_title, video.channel_id
+        row = self._conn.execute(
+            "SELECT id, description, title, channel_title, channel_id FROM videos WHERE video_id = ?", (video.video_id,)
+        ).fetchone()
+
+        if row is None:
+            cursor = self._conn.execute(
+                "INSERT INTO videos (video_id, title, channel_title, channel_id, description, views, length, accessed_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (video.video_id, title, channel_title, channel_id, description,
+                 video.views, video.length, now),
+            )
+            row_id = cursor.lastrowid
+        else:
+            row_id = row[0]
+            description = description or row[1]
+            # A partial record only knows the ID, the indexed title and channel are kept
+            if video.is_partial:
+                title = row[2]
+            channel_title = channel_title or row[3]
+            channel_id = channel_id or row[4]
+            self._conn.execute(
+                "UPDATE videos SET title = ?, channel_title = ?, channel_id = ?, description = ?, "
+                "views = MAX(views, ?), length = MAX(length, ?), accessed_at = ? WHERE id = ?",
+                (title, channel_title, channel_id, description,
+                 video.views, video.length, now, row_id),
+            )
+            if self.has_fts:
+                self._conn.execute("DELETE FROM videos_fts WHERE rowid = ?", (row_id,))
+
+        if self.has_fts:
+            self._conn.execute(
+                "INSERT INTO videos_fts (rowid, title, channel_title, description) VALUES (?, ?, ?, ?)",
+                (row_id, title, channel_title, description),
+            )
+
+    def search(self, query: str, limit: int = VIDEO_INDEX_SEARCH_LIMIT) -> list:
+        """
+        Find indexed videos matching every word of a query, words matched as prefixes.
+
+        Args:
+            query (str): The search query.
+            limit (int): The maximum number of results to return.
+
+        Returns:
+            list: The matching YoutubeVideo objects, best matches first.
+        """
+        words = WORD_PATTERN.findall(query.lower())
+        if not words:
+            return []
+
+        columns = "v.id, v.video_id, v.title, v.channel_title, v.channel_id, v.views, v.length"
+        with self._lock:
+            try:
+                if self.has_fts:
+                    match = " ".join(f'"{word}"*' for word in words)
+                    rows = self._conn.execute(
+                        f"SELECT {columns} FROM videos_fts JOIN videos v ON v.id = videos_fts.rowid "
+                        "WHERE videos_fts MATCH ? ORDER BY bm25(videos_fts, 10.0, 5.0, 1.0) LIMIT ?",
+                        (match, limit),
+                    ).fetchall()
+                else:
+                    conditions = " AND ".join(
+                        "(v.title LIKE ? OR v.channel_title LIKE ? OR v.description LIKE ?)" for _ in words
+                    )
+                    params = [f"%{word}%" for word in words for _ in range(3)]
+                    rows = self._conn.execute(
+                        f"SELECT {columns} FROM videos v WHERE {conditions} ORDER BY v.views DESC LIMIT ?",
+                        (*params, limit),
+                    ).fetchall()
+
+                # Matched videos count as recently used for eviction
+                self._conn.executemany(
+                    "UPDATE videos SET accessed_at = ? WHERE id = ?", [(time.time(), row[0]) for row in rows]
+                )
+                self._conn.commit()
+            except sqlite3.Error as e:
+                logger.error(f"Error searching the video index: {e}")
+                return []
+
+        return [
+            YoutubeVideo(video_id=video_id, title=title, channel_title=channel_title,
+                         channel_id=channel_id, views=views, length=length)
+            for _, video_id, title, channel_title, channel_id, views, length in rows
+        ]
+
+    def _evict(self) -> None:
+        """Drop the least recently used videos over the size limit."""
+        count = self._conn.execute("SELECT COUNT(*) FROM videos").fetchone()[0]
+        if count <= self.max_entries:
+            return
+
+        row_ids = [row[0] for row in self._conn.execute(
+            "SELECT id FROM videos ORDER BY accessed_at ASC LIMIT ?", (count - self.max_entries,)
+        )]
+        self._conn.executemany("DELETE FROM videos WHERE id = ?", [(row_id,) for row_id in row_ids])
+        if self.has_fts:
+            self._conn.executemany("DELETE FROM videos_fts WHERE rowid = ?", [(row_id,) for row_id in row_ids])
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM videos").fetchone()[0]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM videos")
+            if self.has_fts:
+                self._conn.execute("DELETE FROM videos_fts")
+            self._conn.commit()
@@ -1,38 +1,224 @@
 import os
+import re
+import asyncio
 import logging
 import requests
 import json
+import time
+import queue
+import threading
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError, wait, FIRST_COMPLETED
 from io import BytesIO
-from PIL import Image
-from googleapiclient.discovery import build
-from googleapiclient.errors import HttpError
-from pytubefix.contrib.search import Search, Filter
-from pytubefix import YouTube, Channel
-import yt_dlp
-
-logging.basicConfig(
-    filename=f"dev.log",
-    level=logging.DEBUG,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    filemode='w'  # a = append, w = overwrite
+from urllib.parse import urlparse, parse_qs
+from utils.cache import TTLCache, SQLiteCache, get_cache_dir
+from utils.backend_health import BackendHealth
+from utils import extraction_pool
+from utils.extraction_pool import ExtractionProcessPool
+from utils.youtube_video import YoutubeVideo
+from utils.video_index import VideoIndex, video_matches_query
+from utils.youtube_quota import (
+    QuotaLedger,
+    QuotaExceededError,
+    get_quota_ledger,
+    is_quota_exceeded_error,
+    SEARCH_LIST_COST,
+    VIDEOS_LIST_COST,
 )
+from utils.player_js_cache import (
+    restore_pytubefix_player,
+    save_pytubefix_player,
+    restore_ytdlp_player,
+    save_ytdlp_player,
+)
+
 logger = logging.getLogger(__name__)
 
-def image_to_ascii(url, width=40):
-    response = requests.get(url)
-    img = Image.open(BytesIO(response.content))
-    img = img.resize((width, int(img.height * width / img.width)))
-    img = img.convert("L")  # Convert to grayscale
-    pixels = img.getdata()
-    ascii_chars = [" ", ".", ":", "-", "=", "+", "*", "#", "%", "@", "8"]
-    new_pixels = [ascii_chars[pixel // 25] for pixel in pixels]
-    new_image = "".join(
-        ["".join(new_pixels[index : index + width]) + "\n"
-            for index in range(0, len(new_pixels), width)]
-    )
-    return new_image
+CHANNEL_CACHE_TTL = 24 * 60 * 60
+CHANNEL_CACHE_MAXSIZE = 1024
+SEARCH_CACHE_TTL = 30 * 60
+SEARCH_CACHE_STALE_TTL = 7 * 24 * 60 * 60
+SEARCH_CACHE_MAX_ENTRIES = 500
+RECENT_RESULTS_MAXSIZE = 64
+RECENT_RESULTS_TTL = 10 * 60
+AUDIO_URL_CACHE_MAXSIZE = 256
+AUDIO_URL_DEFAULT_TTL = 5 * 60
+AUDIO_URL_EXPIRY_MARGIN = 5 * 60
+# Playback waits at most this long on an in-flight prefetch before resolving the URL itself
+AUDIO_PREFETCH_WAIT_TIMEOUT = 3.0
+HEDGE_DELAY = 2.0
+HYDRATION_POLL_INTERVAL = 0.05
+VIDEO_DETAILS_CACHE_TTL = 6 * 60 * 60
+VIDEO_DETAILS_CACHE_MAXSIZE = 4096
+ISO8601_DURATION_PATTERN = re.compile(r"P(?:(\d+)D)?(?:T(?:(\d+)H)?(?:(\d+)M)?(?:(\d+)S)?)?")
+THUMBNAIL_TIMEOUT = 5
+THUMBNAIL_IMAGE_CACHE_MAXSIZE = 128
+THUMBNAIL_RENDER_CACHE_MAXSIZE = 256
+CHAR_ASPECT_RATIO = 0.5
+# Grayscale ramp, pixel // 25 picks one of the 11 characters
+ASCII_CHARS = " .:-=+*#%@8"
+YOUTUBE_DISCOVERY_URL = "https://www.googleapis.com/discovery/v1/apis/youtube/v3/rest"
+
+
+def _build_channel_cache() -> TTLCache:
+    """Build the channel metadata cache, with an on-disk layer unless YOUTUBE_CHANNEL_CACHE_DISK=0."""
+    disk = None
+    if os.getenv("YOUTUBE_CHANNEL_CACHE_DISK", "1") != "0":
+        try:
+            disk = SQLiteCache(get_cache_dir() / "youtube_channels.sqlite3",
+                               ttl=CHANNEL_CACHE_TTL, max_entries=CHANNEL_CACHE_MAXSIZE * 4)
+        except Exception as e:
+            logger.error(f"Error opening channel cache on disk: {e}")
+    return TTLCache(maxsize=CHANNEL_CACHE_MAXSIZE, ttl=CHANNEL_CACHE_TTL, disk=disk)
+
+
+# Process-wide channel metadata keyed by channel_id, use channel_cache.stats() for hit/miss counters
+channel_cache = _build_channel_cache()
+
+# Views and length from videos().list keyed by video_id
+video_details_cache = TTLCache(maxsize=VIDEO_DETAILS_CACHE_MAXSIZE, ttl=VIDEO_DETAILS_CACHE_TTL)
+
+# Shared keep-alive session for thumbnails
+http_session = requests.Session()
+
+# Raw thumbnails keyed by url, and rendered ones keyed by (url, width, mode)
+thumbnail_image_cache = TTLCache(maxsize=THUMBNAIL_IMAGE_CACHE_MAXSIZE)
+thumbnail_render_cache = TTLCache(maxsize=THUMBNAIL_RENDER_CACHE_MAXSIZE)
+
+# Resolved audio stream URLs keyed by video_id, each entry expires shortly before its googlevideo URL does
+audio_url_cache = TTLCache(maxsize=AUDIO_URL_CACHE_MAXSIZE)
+
+
+def get_stream_url_ttl(url: str) -> float:
+    """
+    Get how long a resolved stream URL can be cached.
+
+    Reads the `expire=` parameter of googlevideo URLs and keeps a safety margin
+    before it, falling back to AUDIO_URL_DEFAULT_TTL when the URL has none.
+
+    Args:
+        url (str): The stream URL.
+
+    Returns:
+        float: The TTL in seconds, 0 if the URL is already about to expire.
+    """
+    expire = parse_qs(urlparse(url).query).get("expire")
+    if not expire:
+        return AUDIO_URL_DEFAULT_TTL
+
+    try:
+        return max(0, int(expire[0]) - time.time() - AUDIO_URL_EXPIRY_MARGIN)
+    except ValueError:
+        return AUDIO_URL_DEFAULT_TTL
+
+def parse_iso8601_duration(duration: str) -> int:
+    """
+    Convert an ISO-8601 duration such as PT1H2M3S to seconds.
+
+    Args:
+        duration (str): The duration returned by the YouTube Data API.
+
+    Returns:
+        int: The duration in seconds, 0 if it could not be parsed.
+    """
+    match = ISO8601_DURATION_PATTERN.fullmatch(duration or "")
+    if not match:
+        return 0
+
+    days, hours, minutes, seconds = (int(value or 0) for value in match.groups())
+    return ((days * 24 + hours) * 60 + minutes) * 60 + seconds
+
+def load_discovery_document() -> str:
+    """
+    Load the YouTube Data API v3 discovery document, caching it on disk.
+
+    The document comes from the copy bundled with google-api-python-client, or
+    from the discovery service when that is missing.
+
+    Returns:
+        str: The discovery document as JSON.
+    """
+    path = get_cache_dir() / "youtube_v3_discovery.json"
+    if path.exists():
+        return path.read_text(encoding="utf-8")
+
+    from googleapiclient.discovery_cache import get_static_doc
+
+    document = get_static_doc("youtube", "v3")
+    if not document:
+        response = requests.get(YOUTUBE_DISCOVERY_URL, timeout=10)
+        response.raise_for_status()
+        document = response.text
+
+    try:
+        path.write_text(document, encoding="utf-8")
+    except OSError as e:
+        logger.error(f"Error caching discovery document: {e}")
+    return document
+
+def fetch_image(url: str) -> bytes:
+    """
+    Download an image over the shared keep-alive session, with a bounded LRU cache.
+
+    Args:
+        url (str): The image URL.
+
+    Returns:
+        bytes: The raw image.
+    """
+    content = thumbnail_image_cache.get(url)
+    if content is None:
+        response = http_session.get(url, timeout=THUMBNAIL_TIMEOUT)
+        response.raise_for_status()
+        content = response.content
+        thumbnail_image_cache.set(url, content)
+    return content
+
+def image_to_ascii(url, width=40, mode="ascii"):
+    """
+    Render an image as text, cached by (url, width, mode).
+
+    Args:
+        url (str): The image URL.
+        width (int): The width of the output in characters.
+        mode (str): "ascii" for grayscale characters, or "color" for half-block
+            cells rendered with rich-pixels.
+
+    Returns:
+        str | rich_pixels.Pixels: The rendered image, a string in ascii mode.
+    """
+    cache_key = (url, width, mode)
+    rendered = thumbnail_render_cache.get(cache_key)
+    if rendered is not None:
+        return rendered
+
+    from PIL import Image
+
+    img = Image.open(BytesIO(fetch_image(url)))
+    # Terminal cells are about twice as tall as they are wide
+    height = max(1, round(img.height * width / img.width * CHAR_ASPECT_RATIO))
+
+    if mode == "color":
+        from rich_pixels import Pixels
+
+        # Each half-block cell shows two pixel rows
+        rendered = Pixels.from_image(img.convert("RGB"), resize=(width, height * 2))
+    else:
+        import numpy as np
+
+        pixels = np.asarray(img.convert("L").resize((width, height)), dtype=np.uint8)
+        ascii_chars = np.frombuffer(ASCII_CHARS.encode("ascii"), dtype=np.uint8)
+        grid = ascii_chars[pixels // 25]
+        newlines = np.full((height, 1), ord("\n"), dtype=np.uint8)
+        rendered = np.hstack((grid, newlines)).tobytes().decode("ascii")
+
+    thumbnail_render_cache.set(cache_key, rendered)
+    return rendered
 
 class BaseYoutubeService:
+    # Daily API quota units charged per method, for backends that have a quota
+    quota_costs = {}
+
     def __init__(self, is_debug: bool = False):
         self.is_debug = is_debug
 
@@ -49,14 +235,98 @@ class BaseYoutubeService:
         """
         raise NotImplementedError("This method should be implemented by subclasses.")
 
+    def iter_search_video(self, query: str, page_size: int = 10, filters: dict = None):
+        """
+        Search for videos on YouTube, yielding each video as soon as it is available.
+
+        Keeps paging through results for as long as the caller keeps iterating.
+
+        Args:
+            query (str): The search query.
+            page_size (int): The number of results fetched per page.
+
+        Yields:
+            YoutubeVideo: The video objects matching the search query.
+        """
+        raise NotImplementedError("This method should be implemented by subclasses.")
+
+    async def aiter_search_video(self, query: str, page_size: int = 10, filters: dict = None, **kwargs):
+        """
+        Async iterator over iter_search_video that pulls each video in a worker thread.
+
+        Args:
+            query (str): The search query.
+            page_size (int): The number of results fetched per page.
+            **kwargs: Extra arguments for iter_search_video.
+
+        Yields:
+            YoutubeVideo: The video objects matching the search query.
+        """
+        iterator = self.iter_search_video(query, page_size, filters, **kwargs)
+        try:
+            while True:
+                video = await asyncio.to_thread(next, iterator, None)
+                if video is None:
+                    return
+                yield video
+        finally:
+            try:
+                iterator.close()
+            except ValueError:
+                # Still running in its worker thread after a cancellation, it is dropped with it
+                pass
+
+    async def search_video_async(self, query: str, max_results: int = 10, filters: dict = None) -> list:
+        """
+        Search for videos on YouTube without blocking the event loop.
+
+        The blocking search runs in a worker thread. When the awaiting task is
+        cancelled, the thread finishes in the background and its result is dropped.
+
+        Args:
+            query (str): The search query.
+            max_results (int): The maximum number of results to return.
+
+        Returns:
+            list: A list of video objects matching the search query.
+        """
+        return await asyncio.to_thread(self.search_video, query, max_results, filters)
+
+    async def get_video_audio_url_async(self, video_id: str) -> str:
+        """
+        Build the audio URL for a YouTube video without blocking the event loop.
+
+        Args:
+            video_id (str): The ID of the YouTube video.
+
+        Returns:
+            str: The direct audio stream URL for the video.
+        """
+        return await asyncio.to_thread(self.get_video_audio_url, video_id)
+
 
 class YoutubeServiceGoogleAPIClient(BaseYoutubeService):
-    def __init__(self, api_key: str = None, is_debug: bool = False):
+    quota_costs = {
+        "search_video": SEARCH_LIST_COST,
+        "iter_search_video": SEARCH_LIST_COST,
+    }
+
+    def __init__(self, api_key: str = None, is_debug: bool = False, quota_ledger: QuotaLedger = None):
         self.api_key = api_key if api_key else os.getenv("YOUTUBE_API_KEY")
         if not self.api_key:
             raise ValueError("YouTube API key is required")
         self.is_debug = is_debug
-        self.youtube_build = build("youtube", "v3", developerKey=self.api_key)
+        self.quota_ledger = quota_ledger or get_quota_ledger()
+        self._youtube_build = None
+
+    @property
+    def youtube_build(self):
+        """The YouTube Data API resource, built on first use from the cached discovery document."""
+        if self._youtube_build is None:
+            from googleapiclient.discovery import build_from_document
+
+            self._youtube_build = build_from_document(load_discovery_document(), developerKey=self.api_key)
+        return self._youtube_build
 
     def search_video(self, query: str, max_results: int = 10, filters: dict = None) -> list:
         """
@@ -69,6 +339,8 @@ class YoutubeServiceGoogleAPIClient(BaseYoutubeService):
         Returns:
             list: A list of video objects matching the search query.
         """
+        from googleapiclient.errors import HttpError
+
         if not self.youtube_build:
             raise RuntimeError("YouTube API client is not available. Check your API key.")
 
@@ -84,54 +356,182 @@ class YoutubeServiceGoogleAPIClient(BaseYoutubeService):
                 search_params.update(filters)
 
             request = self.youtube_build.search().list(**search_params)
-            response = request.execute()
+            response = self._execute(request, "search", SEARCH_LIST_COST)
 
-            videos = []
-
-            for item in response.get("items", []):
-                video_id = item["id"]["videoId"]
-                title = item["snippet"]["title"]
-                description = item["snippet"]["description"]
-                channel_title = item["snippet"]["channelTitle"]
-                channel_id = item["snippet"]["channelId"]
-                thumbnails = item["snippet"]["thumbnails"]
-                watch_url = f"https://www.youtube.com/watch?v={video_id}"
-                embed_url = f"https://www.youtube.com/embed/{video_id}"
-                views = 0  # Placeholder, as views are not available in search results
-                length = 0  # Placeholder, as length is not available in search results
-
-                videos.append({
-                    "video_id": video_id,
-                    "title": title,
-                    "description": description,
-                    "channel_title": channel_title,
-                    "channel_id": channel_id,
-                    "thumbnails": thumbnails,
-                    "watch_url": watch_url,
-                    "embed_url": embed_url,
-                    "title": title,
-                    "views": views,
-                    "length": length,
-                })
+            videos = [self._parse_search_item(item) for item in response.get("items", [])]
+            self._enrich_videos(videos)
 
             if self.is_debug:
-                logger.debug(f"Search results: {json.dumps(videos, indent=2)}")
+                logger.debug(f"Search results: {json.dumps([video.to_dict() for video in videos], indent=2)}")
 
             return videos
 
         except HttpError as e:
+            # Raised, so the backend's circuit breaker counts quota and server errors
             logger.error(f"An error occurred in YoutubeVideoGoogleAPIClient: {e}")
-            return []
+            raise
+
+    def _execute(self, request, feature: str, cost: int) -> dict:
+        """
+        Execute an API request, charging its cost to the quota ledger first.
+
+        The budget is checked and charged in one step, once per call, so every
+        page of a paginated search is checked again.
+
+        Args:
+            request: The googleapiclient request.
+            feature (str): The feature the units are charged to.
+            cost (int): The quota cost of the request.
+
+        Returns:
+            dict: The response.
+
+        Raises:
+            QuotaExceededError: If the daily quota does not cover the request, or the API says it is exceeded.
+        """
+        from googleapiclient.errors import HttpError
+
+        if not self.quota_ledger.try_spend(feature, cost):
+            raise QuotaExceededError(f"YouTube API quota left today does not cover {feature} ({cost} units)")
+
+        try:
+            return request.execute()
+        except HttpError as e:
+            if is_quota_exceeded_error(e):
+                self.quota_ledger.mark_exhausted()
+                raise QuotaExceededError(f"YouTube API quota exceeded: {e}") from e
+            raise
+
+    def iter_search_video(self, query: str, page_size: int = 10, filters: dict = None):
+        """
+        Search for videos on YouTube using the Google API, following pageToken.
+
+        Args:
+            query (str): The search query.
+            page_size (int): The number of results fetched per page.
+
+        Yields:
+            YoutubeVideo: The video objects matching the search query.
+
+        Raises:
+            QuotaExceededError: If the daily quota does not cover the first page.
+        """
+        search_params = {
+            "q": query,
+            "part": "id,snippet",
+            "maxResults": min(page_size, 50),
+            "type": "video",
+        }
+
+        if filters:
+            search_params.update(filters)
+
+        while True:
+            # Every page is charged on its own, stop at the page the quota no longer covers
+            try:
+                response = self._execute(self.youtube_build.search().list(**search_params), "search", SEARCH_LIST_COST)
+            except QuotaExceededError:
+                if "pageToken" not in search_params:
+                    raise
+                logger.warning(f"YouTube API quota does not cover more result pages for {query!r}")
+                return
+
+            videos = [self._parse_search_item(item) for item in response.get("items", [])]
+            self._enrich_videos(videos)
+            yield from videos
+
+            page_token = response.get("nextPageToken")
+            if not page_token:
+                return
+            search_params["pageToken"] = page_token
+
+    def _parse_search_item(self, item: dict) -> YoutubeVideo:
+        """
+        Build a video object from a search().list result item.
+
+        Views and length are not available in search results, _enrich_videos fills them in.
+
+        Args:
+            item (dict): The search result item.
+
+        Returns:
+            YoutubeVideo: The video object.
+        """
+        snippet = item["snippet"]
+
+        return YoutubeVideo(
+            video_id=item["id"]["videoId"],
+            title=snippet["title"],
+            channel_title=snippet["channelTitle"],
+            channel_id=snippet["channelId"],
+            # The snippet holds a short description that comes for free
+            description=snippet.get("description", ""),
+        )
+
+    def _enrich_videos(self, videos: list) -> None:
+        """
+        Fill in views and length with one batched videos().list request.
+
+        Details are kept in a per-ID cache, so only IDs that were never seen are
+        requested. IDs the API does not return, e.g. private or deleted videos,
+        are cached as empty entries so they are not asked for again either.
+
+        Args:
+            videos (list): The video objects to update in place.
+        """
+        from googleapiclient.errors import HttpError
+
+        missing_ids = list(dict.fromkeys(
+            video.video_id for video in videos if video.video_id not in video_details_cache
+        ))
+
+        # videos().list accepts at most 50 IDs per request
+        for start in range(0, len(missing_ids), 50):
+            batch_ids = missing_ids[start:start + 50]
+            try:
+                request = self.youtube_build.videos().list(
+                    part="statistics,contentDetails",
+                    id=",".join(batch_ids),
+                )
+                response = self._execute(request, "video_details", VIDEOS_LIST_COST)
+            except (HttpError, QuotaExceededError) as e:
+                logger.error(f"Error fetching video details in YoutubeVideoGoogleAPIClient: {e}")
+                return
+
+            for item in response.get("items", []):
+                video_details_cache.set(item["id"], {
+                    "views": int(item.get("statistics", {}).get("viewCount", 0)),
+                    "length": parse_iso8601_duration(item.get("contentDetails", {}).get("duration", "")),
+                })
+
+            for video_id in batch_ids:
+                if video_id not in video_details_cache:
+                    video_details_cache.set(video_id, {})
+
+        for video in videos:
+            details = video_details_cache.get(video.video_id)
+            if details:
+                video.views = details["views"]
+                video.length = details["length"]
 
 
 class YoutubeServicePyTube(BaseYoutubeService):
-    def __init__(self, is_debug: bool = False):
+    def __init__(self, is_debug: bool = False, max_workers: int = 8, item_timeout: float = 8.0,
+                 process_pool: ExtractionProcessPool = None):
         self.is_debug = is_debug
+        self.max_workers = max_workers
+        self.item_timeout = item_timeout
+        self.process_pool = process_pool
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="pytube-hydrate")
 
     def search_video(self, query: str, max_results: int = 10, filters: dict = None) -> list:
         """
         Search for videos on YouTube using the pytubefix library.
 
+        Metadata for each result is hydrated concurrently on a bounded thread pool.
+        Results keep the search order, and items that do not finish within
+        `item_timeout` seconds of starting are returned as partial records.
+
         Args:
             query (str): The search query.
             max_results (int): The maximum number of results to return.
@@ -139,47 +539,189 @@ class YoutubeServicePyTube(BaseYoutubeService):
         Returns:
             list: A list of video objects matching the search query.
         """
+        from pytubefix.contrib.search import Search
+
         s = Search(query, filters=self.build_filters(filters))
         videos = s.videos
         videos = videos[:max_results]
 
-        data = []
-
-        for video in videos:
-            yt_video = YouTube(url=video.watch_url)
-            channel_data = {}
-            try:
-                channel = Channel(url=yt_video.channel_url)
-                channel_data = {
-                    "channel_title": channel.title,
-                }
-            except Exception as e:
-                channel_data = {
-                    "channel_title": "",
-                }
-
-            data.append({
-                "video_id": yt_video.video_id,
-                "title": yt_video.title,
-                "description": yt_video.description,
-                "channel_id": yt_video.channel_id,
-                "thumbnails": {
-                    "default": {
-                        "url": yt_video.thumbnail_url,
-                    },
-                },
-                "watch_url": yt_video.watch_url,
-                "embed_url": yt_video.embed_url,
-                "views": yt_video.views,
-                "length": int(yt_video.length),
-                **channel_data
-            })
+        data = list(self._hydrate_videos(videos))
 
         if self.is_debug:
-            logger.debug(f"Search results: {json.dumps(data, indent=2)}")
+            logger.debug(f"Search results: {json.dumps([video.to_dict() for video in data], indent=2)}")
 
         return data
 
+    def iter_search_video(self, query: str, page_size: int = 10, filters: dict = None):
+        """
+        Search for videos on YouTube using pytubefix, following search continuations.
+
+        Each page is hydrated concurrently and its videos are yielded in order
+        as soon as they are ready.
+
+        Args:
+            query (str): The search query.
+            page_size (int): The number of results hydrated per batch.
+
+        Yields:
+            YoutubeVideo: The video objects matching the search query.
+        """
+        from pytubefix.contrib.search import Search
+
+        s = Search(query, filters=self.build_filters(filters))
+        seen = 0
+
+        while True:
+            videos = s.videos[seen:]
+            if not videos:
+                return
+
+            yield from self._hydrate_videos(videos, page_size)
+
+            seen += len(videos)
+            s.get_next_results()
+
+            # Without a continuation pytubefix starts over, which brings nothing new
+            if len(s.videos) <= seen:
+                return
+
+    def _hydrate_videos(self, videos: list, batch_size: int = None):
+        """
+        Hydrate search results concurrently, yielding them in search order.
+
+        A sliding window of at most the pool size is kept in flight, and the
+        next item is submitted as soon as one finishes, so a slow item only
+        holds up its own slot. Each item gets `item_timeout` seconds from when
+        it starts running, so time spent queued does not count against it. An
+        item that does not even start within `item_timeout` is given up on
+        too. Items that time out or fail are yielded as partial records.
+
+        Args:
+            videos (list): The pytubefix search results.
+            batch_size (int): The largest number of items in flight at once.
+
+        Yields:
+            YoutubeVideo: The video objects.
+        """
+        pool_size = self.process_pool.max_workers if self.process_pool is not None else self.max_workers
+        window = min(batch_size or pool_size, pool_size)
+        futures = {}
+        submitted_at = {}
+        started_at = {}
+        results = {}
+        next_submit = 0
+        next_index = 0
+
+        try:
+            while next_index < len(videos):
+                while next_submit < len(videos) and len(futures) < window:
+                    futures[next_submit] = self._submit_hydration(videos[next_submit].watch_url)
+                    submitted_at[next_submit] = time.monotonic()
+                    next_submit += 1
+
+                now = time.monotonic()
+                finished = False
+                for index, future in list(futures.items()):
+                    video = videos[index]
+                    if future.done():
+                        results[index] = self._hydration_result(video, future)
+                    else:
+                        if future.running():
+                            started_at.setdefault(index, now)
+                        if now - started_at.get(index, submitted_at[index]) < self.item_timeout:
+                            continue
+                        future.cancel()
+                        logger.warning(f"Timed out hydrating video {video.video_id}, returning partial record")
+                        results[index] = self._partial_video(video)
+                    del futures[index]
+                    finished = True
+
+                while next_index in results:
+                    yield results.pop(next_index)
+                    next_index += 1
+
+                # A finished item frees a slot, refill the window before waiting again
+                if not finished and futures:
+                    wait(list(futures.values()), timeout=HYDRATION_POLL_INTERVAL, return_when=FIRST_COMPLETED)
+        finally:
+            # The caller stopped early, drop what has not started
+            for future in futures.values():
+                future.cancel()
+
+    def _hydration_result(self, video, future) -> YoutubeVideo:
+        try:
+            return future.result()
+        except Exception as e:
+            logger.error(f"Error hydrating video {video.video_id}: {str(e)}")
+            return self._partial_video(video)
+
+    def _submit_hydration(self, watch_url: str):
+        """Hydrate a video on the process pool when there is one, otherwise on the thread pool."""
+        if self.process_pool is not None:
+            return self.process_pool.submit(extraction_pool.hydrate_video, watch_url)
+        return self._executor.submit(self._hydrate_video, watch_url)
+
+    def _hydrate_video(self, watch_url: str) -> YoutubeVideo:
+        """
+        Fetch the full metadata for a single search result.
+
+        Args:
+            watch_url (str): The watch URL of the video.
+
+        Returns:
+            YoutubeVideo: The video object.
+        """
+        from pytubefix import YouTube
+
+        yt_video = YouTube(url=watch_url)
+
+        return YoutubeVideo(
+            video_id=yt_video.video_id,
+            title=yt_video.title,
+            channel_title=self._get_channel_title(yt_video.channel_id, yt_video.channel_url),
+            channel_id=yt_video.channel_id,
+            views=yt_video.views,
+            length=yt_video.length,
+        )
+
+    def _get_channel_title(self, channel_id: str, channel_url: str) -> str:
+        """
+        Get a channel title, using the process-wide channel cache when possible.
+
+        Args:
+            channel_id (str): The ID of the channel.
+            channel_url (str): The URL of the channel.
+
+        Returns:
+            str: The channel title, or an empty string if it could not be fetched.
+        """
+        channel = channel_cache.get(channel_id)
+        if channel is not None:
+            return channel["title"]
+
+        from pytubefix import Channel
+
+        try:
+            title = Channel(url=channel_url).title
+        except Exception as e:
+            logger.error(f"Error fetching channel {channel_id}: {str(e)}")
+            return ""
+
+        channel_cache.set(channel_id, {"title": title})
+        return title
+
+    def _partial_video(self, video) -> YoutubeVideo:
+        """
+        Build a video object from what is known without any network round trip.
+
+        Args:
+            video: The pytubefix search result.
+
+        Returns:
+            YoutubeVideo: The partial video object, titled with its ID.
+        """
+        return YoutubeVideo(video_id=video.video_id)
+
     def get_video_audio_url(self, video_id: str) -> str:
         """
         Build the stream URL for a YouTube video using pytubefix.
@@ -190,6 +732,13 @@ class YoutubeServicePyTube(BaseYoutubeService):
         Returns:
             str: The stream URL for the video.
         """
+        if self.process_pool is not None:
+            return self.process_pool.run(extraction_pool.resolve_audio_url, "pytube", video_id)
+
+        from pytubefix import YouTube
+
+        restore_pytubefix_player()
+
         yt_video = YouTube(url=f"https://www.youtube.com/watch?v={video_id}")
 
         if not yt_video:
@@ -200,7 +749,9 @@ class YoutubeServicePyTube(BaseYoutubeService):
         if not stream:
             raise RuntimeError("No audio stream available for this video.")
 
-        return stream.url
+        audio_url = stream.url
+        save_pytubefix_player()
+        return audio_url
 
     def build_filters(self, filters: dict) -> dict:
         """
@@ -210,7 +761,7 @@ class YoutubeServicePyTube(BaseYoutubeService):
             filters (dict): A dictionary of filters to apply.
 
         Returns:
-            list: A list of Filter objects.
+            dict: The filters for pytubefix Search.
         """
         processed_filter = {}
 
@@ -219,9 +770,114 @@ class YoutubeServicePyTube(BaseYoutubeService):
         return processed_filter
 
 
+class YoutubeDLPool:
+    """
+    Long-lived yt_dlp.YoutubeDL instances, pooled per option profile.
+
+    Building a YoutubeDL registers every extractor and processes its options,
+    so instances are kept and reused. Each instance is handed to one thread at
+    a time, and at most `size` instances exist per profile.
+    """
+    def __init__(self, size: int = 2):
+        self.size = size
+        self._pools = {}
+        self._lock = threading.Lock()
+        import atexit
+        atexit.register(self.close)
+
+    @contextmanager
+    def acquire(self, ydl_opts: dict, **overrides):
+        """
+        Borrow a YoutubeDL instance built with the given options.
+
+        Args:
+            ydl_opts (dict): The options of the profile.
+            **overrides: Per-call params, restored when the instance is returned.
+
+        Yields:
+            yt_dlp.YoutubeDL: The instance, for the exclusive use of the caller.
+        """
+        profile = json.dumps(ydl_opts, sort_keys=True, default=str)
+        should_build = False
+
+        with self._lock:
+            if profile not in self._pools:
+                self._pools[profile] = (queue.LifoQueue(), [0])
+            instances, created = self._pools[profile]
+
+            try:
+                ydl = instances.get_nowait()
+            except queue.Empty:
+                ydl = None
+                # Reserve the slot here, the slow construction runs outside the lock
+                if created[0] < self.size:
+                    created[0] += 1
+                    should_build = True
+
+        if should_build:
+            ydl = self._build(ydl_opts, created)
+        elif ydl is None:
+            ydl = instances.get()
+
+        previous = {key: ydl.params[key] for key in overrides if key in ydl.params}
+        ydl.params.update(overrides)
+        try:
+            yield ydl
+        finally:
+            # Keys the profile did not set are dropped, a None left behind is not the same as unset
+            for key in overrides:
+                if key not in previous:
+                    ydl.params.pop(key, None)
+            ydl.params.update(previous)
+            instances.put(ydl)
+
+    def _build(self, ydl_opts: dict, created: list):
+        """Build an instance for a reserved slot, giving the slot back if construction fails."""
+        import yt_dlp
+
+        try:
+            ydl = yt_dlp.YoutubeDL(ydl_opts)
+            restore_ytdlp_player(ydl)
+            return ydl
+        except Exception:
+            with self._lock:
+                created[0] -= 1
+            raise
+
+    def close(self) -> None:
+        """Close every idle instance."""
+        with self._lock:
+            for instances, _ in self._pools.values():
+                while True:
+                    try:
+                        instances.get_nowait().close()
+                    except queue.Empty:
+                        break
+                    except Exception:
+                        pass
+            self._pools.clear()
+
+
 class YoutubeServiceYTDLP(BaseYoutubeService):
-    def __init__(self, is_debug: bool = False):
+    SEARCH_OPTS = {
+        'quiet': True,
+        'no_warnings': True,
+        'extract_flat': True,
+    }
+
+    AUDIO_OPTS = {
+        'format': 'bestaudio',
+        'quiet': True,
+        'no_warnings': True,
+        'extract_flat': True,
+    }
+
+    def __init__(self, is_debug: bool = False, pool_size: int = 2, process_pool: ExtractionProcessPool = None):
         self.is_debug = is_debug
+        self.process_pool = process_pool
+        self.ydl_pool = YoutubeDLPool(size=pool_size)
+        # Shared by every worker process, yt-dlp keeps deciphered signature functions there
+        self.audio_opts = {**self.AUDIO_OPTS, 'cachedir': str(get_cache_dir() / "yt-dlp")}
 
     def search_video(self, query: str, max_results: int = 10, filters: dict = None) -> list:
         """
@@ -233,29 +889,74 @@ class YoutubeServiceYTDLP(BaseYoutubeService):
 
         Returns:
             list: A list of video objects matching the search query.
-        """
 
-        ydl_opts = {
-            'quiet': True,
-            'no_warnings': True,
-            'extract_flat': True,
-            'default_search': 'ytsearch',
-            'max_downloads': max_results,
-        }
 
-        if filters:
-            ydl_opts.update(filters)
+        Raises:
+            Exception: Whatever yt-dlp raised, so the failure reaches the circuit breaker.
+        """
+        ydl_opts = {**self.SEARCH_OPTS, **(filters or {})}
 
-        with yt_dlp.YoutubeDL(ydl_opts) as ydl:
+        with self.ydl_pool.acquire(ydl_opts) as ydl:
             try:
-                result = ydl.extract_info(query, download=False)
-                if 'entries' in result:
-                    return result['entries']
-                else:
-                    return [result]
+                result = ydl.extract_info(f"ytsearch{max_results}:{query}", download=False)
             except Exception as e:
+                # Raised, so the backend's circuit breaker counts the failure
                 logger.error(f"Error searching videos with yt-dlp: {str(e)}")
-                return []
+                raise
+
+        if 'entries' in result:
+            return [self._entry_to_video(entry) for entry in result['entries'] if entry]
+        else:
+            return [self._entry_to_video(result)]
+
+    def iter_search_video(self, query: str, page_size: int = 10, filters: dict = None):
+        """
+        Search for videos on YouTube using yt-dlp, widening ytsearchN one page at a time.
+
+        Args:
+            query (str): The search query.
+            page_size (int): The number of results fetched per page.
+
+        Yields:
+            YoutubeVideo: The video objects matching the search query.
+        """
+        ydl_opts = {**self.SEARCH_OPTS, **(filters or {})}
+        start = 1
+
+        while True:
+            end = start + page_size - 1
+
+            with self.ydl_pool.acquire(ydl_opts, playliststart=start, playlistend=end) as ydl:
+                result = ydl.extract_info(f"ytsearch{end}:{query}", download=False)
+
+            entries = [entry for entry in result.get("entries", []) if entry]
+            for entry in entries:
+                yield self._entry_to_video(entry)
+
+            if len(entries) < page_size:
+                return
+            start = end + 1
+
+    def _entry_to_video(self, entry: dict) -> YoutubeVideo:
+        """
+        Build a video object from a flat yt-dlp search entry.
+
+        Args:
+            entry (dict): The yt-dlp entry.
+
+        Returns:
+            YoutubeVideo: The video object.
+        """
+        return YoutubeVideo(
+            video_id=entry.get("id", ""),
+            title=entry.get("title"),
+            channel_title=entry.get("channel") or entry.get("uploader"),
+            channel_id=entry.get("channel_id"),
+            views=entry.get("view_count"),
+            length=entry.get("duration"),
+            # Flat entries only carry a description when yt-dlp got one for free
+            description=entry.get("description"),
+        )
 
     def get_video_audio_url(self, video_id: str) -> str:
         """
@@ -267,19 +968,15 @@ class YoutubeServiceYTDLP(BaseYoutubeService):
         Returns:
             str: The direct audio stream URL for the video.
         """
+        if self.process_pool is not None:
+            return self.process_pool.run(extraction_pool.resolve_audio_url, "ytdlp", video_id)
 
         url = f"https://www.youtube.com/watch?v={video_id}"
 
-        ydl_opts = {
-            'format': 'bestaudio',
-            'quiet': True,
-            'no_warnings': True,
-            'extract_flat': True,
-        }
-
         try:
-            with yt_dlp.YoutubeDL(ydl_opts) as ydl:
+            with self.ydl_pool.acquire(self.audio_opts) as ydl:
                 info = ydl.extract_info(url, download=False)
+                save_ytdlp_player(ydl)
                 if 'url' in info:
                     return info['url']
                 else:
@@ -290,34 +987,447 @@ class YoutubeServiceYTDLP(BaseYoutubeService):
 
 
 class YoutubeVideoService(BaseYoutubeService):
-    def __init__(self, is_debug: bool = False):
+    def __init__(self, is_debug: bool = False, search_cache_ttl: float = SEARCH_CACHE_TTL,
+                 search_cache_stale_ttl: float = SEARCH_CACHE_STALE_TTL,
+                 search_cache_max_entries: int = SEARCH_CACHE_MAX_ENTRIES,
+                 execution_mode: str = None, hedge_delay: float = HEDGE_DELAY,
+                 process_pool_size: int = None):
         self.is_debug = is_debug
-        self.services = []
+        self.service_classes = [YoutubeServiceGoogleAPIClient, YoutubeServicePyTube, YoutubeServiceYTDLP]
+        self.service_options = {}
+
+        # Extraction runs in worker processes when YOUTUBE_PROCESS_POOL_SIZE is set
+        if process_pool_size is None:
+            process_pool_size = int(os.getenv("YOUTUBE_PROCESS_POOL_SIZE", 0))
+        self.process_pool = ExtractionProcessPool(max_workers=process_pool_size) if process_pool_size > 0 else None
+        if self.process_pool is not None:
+            self.service_options[YoutubeServicePyTube] = {"process_pool": self.process_pool}
+            self.service_options[YoutubeServiceYTDLP] = {"process_pool": self.process_pool}
+        self.quota_ledger = get_quota_ledger()
+        self.service_options[YoutubeServiceGoogleAPIClient] = {"quota_ledger": self.quota_ledger}
+        self._services = {}
+        self._services_lock = threading.Lock()
+        self.execution_mode = execution_mode or os.getenv("YOUTUBE_EXECUTION_MODE", "hedged")
+        self.hedge_delay = hedge_delay
+        self._hedge_executor = ThreadPoolExecutor(max_workers=8, thread_name_prefix="youtube-hedge")
+        self.search_cache_ttl = search_cache_ttl
+        self.search_cache = None
+        self._refreshing_searches = set()
+        self._refreshing_lock = threading.Lock()
+        # Videos streamed for recent queries, keyed by normalized query, used to suggest results for longer queries
+        self.recent_results = TTLCache(maxsize=RECENT_RESULTS_MAXSIZE, ttl=RECENT_RESULTS_TTL)
 
-        # Initialize services
-        self.services.append(YoutubeServiceGoogleAPIClient(is_debug=self.is_debug))
-        self.services.append(YoutubeServicePyTube(is_debug=self.is_debug))
-        self.services.append(YoutubeServiceYTDLP(is_debug=self.is_debug))
+        try:
+            self.search_cache = SQLiteCache(get_cache_dir() / "youtube_searches.sqlite3",
+                                            ttl=search_cache_stale_ttl, max_entries=search_cache_max_entries)
+        except Exception as e:
+            logger.error(f"Error opening search cache: {e}")
 
-    def search_video(self, query: str, max_results: int = 10, filters: dict = None) -> list:
+        # Every video that comes back from a backend is indexed for local searches
+        self.video_index = None
+        try:
+            self.video_index = VideoIndex()
+        except Exception as e:
+            logger.error(f"Error opening video index: {e}")
+
+        # Services are constructed on first use, see _get_service
+        self.health = {service_class.__name__: BackendHealth(service_class.__name__) for service_class in self.service_classes}
+
+    def search_video(self, query: str, max_results: int = 10, filters: dict = None, on_refresh=None) -> list:
         """
         Search for videos on YouTube using the Google API or pytubefix library.
 
+        Results are served from the search cache when possible. A stale entry is
+        returned right away and refreshed in a background thread; `on_refresh`
+        is then called with the new results.
+
         Args:
             query (str): The search query.
             max_results (int): The maximum number of results to return.
+            filters (dict): Backend specific search filters.
+            on_refresh (callable): Called with the refreshed results after a stale hit.
 
         Returns:
             list: A list of video objects matching the search query.
         """
-        for service in self.services:
+        cache_key = self._search_cache_key(query, max_results, filters)
+
+        if self.search_cache is not None:
+            videos, age = self.search_cache.get_with_age(cache_key)
+            if age is not None and age <= self.search_cache.ttl:
+                if age > self.search_cache_ttl:
+                    self._refresh_search_in_background(cache_key, query, max_results, filters, on_refresh)
+                return [YoutubeVideo.from_dict(video) for video in videos]
+
+        return self._search_and_cache(cache_key, query, max_results, filters)
+
+    async def search_video_async(self, query: str, max_results: int = 10, filters: dict = None, on_refresh=None) -> list:
+        """
+        Search for videos on YouTube without blocking the event loop, see search_video.
+
+        Args:
+            query (str): The search query.
+            max_results (int): The maximum number of results to return.
+            filters (dict): Backend specific search filters.
+            on_refresh (callable): Called with the refreshed results after a stale hit.
+
+        Returns:
+            list: A list of video objects matching the search query.
+        """
+        return await asyncio.to_thread(self.search_video, query, max_results, filters, on_refresh)
+
+    def iter_search_video(self, query: str, page_size: int = 10, filters: dict = None, on_refresh=None,
+                          spend_quota: bool = True):
+        """
+        Search for videos on YouTube, yielding each video as soon as it is available.
+
+        A cached first page is yielded right away, with the same stale-while-revalidate
+        rules as search_video. A cached page shorter than page_size holds every result,
+        so no backend is asked for more. Further videos come from the healthiest backend that
+        can stream, falling back to the next one when it fails before its first video.
+
+        Args:
+            query (str): The search query.
+            page_size (int): The number of results fetched per page.
+            filters (dict): Backend specific search filters.
+            on_refresh (callable): Called with the refreshed first page after a stale hit.
+            spend_quota (bool): False leaves out the backends that spend API quota,
+                e.g. for searches run while the user is still typing.
+
+        Yields:
+            YoutubeVideo: The video objects matching the search query.
+        """
+        cache_key = self._search_cache_key(query, page_size, filters)
+        seen = set()
+        first_page = []
+        recent_videos = []
+        self.recent_results.set(self._normalize_query(query), recent_videos)
+
+        if self.search_cache is not None:
+            videos, age = self.search_cache.get_with_age(cache_key)
+            if age is not None and age <= self.search_cache.ttl:
+                if age > self.search_cache_ttl:
+                    self._refresh_search_in_background(cache_key, query, page_size, filters, on_refresh, spend_quota)
+                first_page = None
+                for video in videos:
+                    video = YoutubeVideo.from_dict(video)
+                    seen.add(video.video_id)
+                    recent_videos.append(video)
+                    yield video
+                # A page shorter than page_size was cached when the stream ended, it holds every result
+                if len(videos) < page_size:
+                    return
+
+        for service_class in self._ordered_services("iter_search_video", spend_quota):
+            health = self.health[service_class.__name__]
+            if not health.allow_request():
+                continue
+
+            try:
+                service = self._get_service(service_class)
+            except Exception:
+                continue
+
+            started_at = time.monotonic()
+            has_streamed = False
+
+            try:
+                for video in service.iter_search_video(query, page_size, filters):
+                    if not has_streamed:
+                        health.record_success(time.monotonic() - started_at)
+                        has_streamed = True
+
+                    if video.video_id in seen:
+                        continue
+                    seen.add(video.video_id)
+
+                    if first_page is not None:
+                        first_page.append(video)
+                        if len(first_page) == page_size:
+                            self._cache_search_results(cache_key, first_page)
+                            first_page = None
+
+                    self._index_videos([video])
+                    recent_videos.append(video)
+                    yield video
+
+                # A query with fewer results than a page ends the stream before the page fills
+                if first_page:
+                    self._cache_search_results(cache_key, first_page)
+                return
+            except Exception as e:
+                if has_streamed:
+                    logger.error(f"Error streaming videos with {service_class.__name__}: {str(e)}")
+                    return
+                health.record_failure(time.monotonic() - started_at)
+                logger.error(f"Error streaming videos with {service_class.__name__}: {str(e)}")
+
+        if not seen:
+            raise RuntimeError("All services failed streaming videos.")
+
+    def _cache_search_results(self, cache_key: str, videos: list) -> None:
+        """Store search results in the search cache, unless some are partial records that a later search may fill in."""
+        if self.search_cache is not None and videos and not any(video.is_partial for video in videos):
+            self.search_cache.set(cache_key, [video.to_dict() for video in videos])
+
+    def _search_and_cache(self, cache_key: str, query: str, max_results: int, filters: dict,
+                          spend_quota: bool = True) -> list:
+        videos = self._call_services("search_video", (query, max_results, filters), "searching videos", spend_quota)
+
+        self._cache_search_results(cache_key, videos)
+        self._index_videos(videos)
+        return videos
+
+    def _index_videos(self, videos: list) -> None:
+        if self.video_index is not None and videos:
+            self.video_index.add(videos)
+
+    def search_local(self, query: str, max_results: int = 20) -> list:
+        """
+        Search the videos seen in earlier results, without any network access.
+
+        Args:
+            query (str): The search query.
+            max_results (int): The maximum number of results to return.
+
+        Returns:
+            list: The matching YoutubeVideo objects, best matches first.
+        """
+        if self.video_index is None:
+            return []
+        return self.video_index.search(query, limit=max_results)
+
+    async def search_local_async(self, query: str, max_results: int = 20) -> list:
+        """Search the local video index without blocking the event loop, see search_local."""
+        return await asyncio.to_thread(self.search_local, query, max_results)
+
+    def _call_services(self, method_name: str, args: tuple, action: str, spend_quota: bool = True):
+        """
+        Call a method on the backends according to the execution mode.
+
+        In "sequential" mode the backends are tried strictly in order. In "hedged"
+        mode the next backend is started whenever the running ones have not
+        answered within `hedge_delay` seconds, and in "race" mode all of them
+        start at once. The first non-empty result wins and the rest are cancelled.
+
+        Args:
+            method_name (str): The backend method to call.
+            args (tuple): The positional arguments for the method.
+            action (str): Describes the call in log and error messages.
+            spend_quota (bool): False leaves out the backends that spend API quota.
+
+        Raises:
+            RuntimeError: If every backend fails.
+        """
+        service_classes = self._ordered_services(method_name, spend_quota)
+
+        if self.execution_mode in ("hedged", "race"):
+            return self._call_services_hedged(service_classes, method_name, args, action)
+
+        for service_class in service_classes:
+            if not self.health[service_class.__name__].allow_request():
+                continue
             try:
-                return service.search_video(query, max_results, filters)
+                return self._call_service(service_class, method_name, args)
             except Exception as e:
-                logger.error(f"Error searching videos with {service.__class__.__name__}: {str(e)}")
+                logger.error(f"Error {action} with {service_class.__name__}: {str(e)}")
                 continue
-        raise RuntimeError("All services failed to search videos.")
+        raise RuntimeError(f"All services failed {action}.")
+
+    def _ordered_services(self, method_name: str, spend_quota: bool = True) -> list:
+        """
+        Get the backends that implement a method, healthiest and fastest first.
+
+        Backends whose circuit breaker is not closed are ordered last. Callers
+        check `allow_request()` only right before they call a backend, so a
+        half-open breaker's single probe is not used up by a backend that is
+        never reached. Backends that spend API quota are left out when today's
+        quota cannot cover the call, and tried last once it runs low. With
+        `spend_quota` False they are left out altogether.
+        """
+        quota_is_low = self.quota_ledger.is_low()
+
+        def sort_key(service_class):
+            spends_quota = quota_is_low and service_class.quota_costs.get(method_name, 0) > 0
+            return (spends_quota, self.health[service_class.__name__].sort_key())
+
+        def within_quota(service_class):
+            cost = service_class.quota_costs.get(method_name, 0)
+            return (spend_quota or cost == 0) and self.quota_ledger.can_spend(cost)
 
+        service_classes = [
+            service_class for service_class in self.service_classes
+            if hasattr(service_class, method_name) and within_quota(service_class)
+        ]
+        service_classes.sort(key=sort_key)
+        return service_classes
+
+    def _get_service(self, service_class: type) -> BaseYoutubeService:
+        """
+        Get the instance of a backend, constructing it on first use.
+
+        A backend that fails to construct has its circuit breaker opened, so it
+        is skipped until the breaker lets a probe through again.
+        """
+        with self._services_lock:
+            service = self._services.get(service_class)
+            if service is not None:
+                return service
+
+            try:
+                service = service_class(is_debug=self.is_debug, **self.service_options.get(service_class, {}))
+            except Exception as e:
+                logger.error(f"Skipping {service_class.__name__}: {str(e)}")
+                self.health[service_class.__name__].trip()
+                raise
+
+            self._services[service_class] = service
+            return service
+
+    def _call_service(self, service_class: type, method_name: str, args: tuple):
+        """Call a backend method and record its latency and outcome."""
+        service = self._get_service(service_class)
+        health = self.health[service_class.__name__]
+        started_at = time.monotonic()
+        try:
+            result = getattr(service, method_name)(*args)
+        except Exception:
+            health.record_failure(time.monotonic() - started_at)
+            raise
+        # An empty answer says nothing about the backend, it must not rank it as healthy and fast
+        if result:
+            health.record_success(time.monotonic() - started_at)
+        else:
+            health.record_empty()
+        return result
+
+    def backend_stats(self) -> list:
+        """Get the health statistics of every backend."""
+        return [health.stats() for health in self.health.values()]
+
+    def quota_stats(self) -> dict:
+        """Get today's YouTube API quota usage, with the units spent per feature."""
+        return self.quota_ledger.stats()
+
+    def _call_services_hedged(self, service_classes: list, method_name: str, args: tuple, action: str):
+        remaining = list(service_classes)
+        pending = {}
+        fallback = None
+        has_fallback = False
+
+        def launch() -> bool:
+            """Start the next backend whose circuit breaker lets a call through."""
+            while remaining:
+                service_class = remaining.pop(0)
+                if self.health[service_class.__name__].allow_request():
+                    pending[self._hedge_executor.submit(self._call_service, service_class, method_name, args)] = service_class
+                    return True
+            return False
+
+        launch()
+        while self.execution_mode == "race" and launch():
+            pass
+
+        while pending:
+            done, _ = wait(pending, timeout=self.hedge_delay if remaining else None, return_when=FIRST_COMPLETED)
+
+            if not done:
+                logger.warning(f"No answer {action} within {self.hedge_delay}s, hedging with the next backend")
+                launch()
+                continue
+
+            for future in done:
+                service_class = pending.pop(future)
+                try:
+                    result = future.result()
+                except Exception as e:
+                    logger.error(f"Error {action} with {service_class.__name__}: {str(e)}")
+                    continue
+
+                if result:
+                    for other in pending:
+                        other.cancel()
+                    return result
+
+                if not has_fallback:
+                    fallback, has_fallback = result, True
+
+            # Failed fast, no reason to wait out the hedge delay
+            if not pending and remaining:
+                launch()
+
+        if has_fallback:
+            return fallback
+        raise RuntimeError(f"All services failed {action}.")
+
+    def _refresh_search_in_background(self, cache_key: str, query: str, max_results: int,
+                                      filters: dict, on_refresh=None, spend_quota: bool = True) -> None:
+        """Re-run a search whose cached results are stale, at most once at a time per key."""
+        with self._refreshing_lock:
+            if cache_key in self._refreshing_searches:
+                return
+            self._refreshing_searches.add(cache_key)
+
+        def refresh():
+            try:
+                videos = self._search_and_cache(cache_key, query, max_results, filters, spend_quota)
+                if videos and on_refresh:
+                    on_refresh(videos)
+            except Exception as e:
+                logger.error(f"Error refreshing search '{query}': {str(e)}")
+            finally:
+                with self._refreshing_lock:
+                    self._refreshing_searches.discard(cache_key)
+
+        threading.Thread(target=refresh, daemon=True).start()
+
+    def _search_cache_key(self, query: str, max_results: int, filters: dict) -> str:
+        """Build the search cache key from the normalized query, max_results and filters."""
+        return json.dumps([self._normalize_query(query), max_results, filters or {}], sort_keys=True)
+
+    def _normalize_query(self, query: str) -> str:
+        return " ".join(query.lower().split())
+
+    def suggest_videos(self, query: str, max_results: int = 10, filters: dict = None) -> list:
+        """
+        Get videos for a query without any network access, e.g. while it is still being typed.
+
+        Combines the cached results of the query, the videos streamed for the
+        longest recent query it extends that match it, and the local video index.
+
+        Args:
+            query (str): The search query.
+            max_results (int): The maximum number of results to return.
+            filters (dict): Backend specific search filters, part of the search cache key.
+
+        Returns:
+            list: YoutubeVideo objects, without duplicates.
+        """
+        videos = []
+
+        if self.search_cache is not None:
+            cached, age = self.search_cache.get_with_age(self._search_cache_key(query, max_results, filters))
+            if age is not None and age <= self.search_cache.ttl:
+                videos.extend(YoutubeVideo.from_dict(video) for video in cached)
+
+        normalized_query = self._normalize_query(query)
+        for end in range(len(normalized_query), 0, -1):
+            recent_videos = self.recent_results.get(normalized_query[:end])
+            if recent_videos:
+                videos.extend(video for video in list(recent_videos) if video_matches_query(video, normalized_query))
+                break
+
+        if len(videos) < max_results:
+            videos.extend(self.search_local(query, max_results))
+
+        unique_videos = {}
+        for video in videos:
+            unique_videos.setdefault(video.video_id, video)
+        return list(unique_videos.values())[:max_results]
+
+    async def suggest_videos_async(self, query: str, max_results: int = 10, filters: dict = None) -> list:
+        """Get videos for a query without blocking the event loop, see suggest_videos."""
+        return await asyncio.to_thread(self.suggest_videos, query, max_results, filters)
 
     def get_video_audio_url(self, video_id: str) -> str:
         """
@@ -333,11 +1443,94 @@ class YoutubeVideoService(BaseYoutubeService):
         Raises:
             RuntimeError: If both methods fail to get the audio URL.
         """
+        audio_url = audio_url_cache.get(video_id)
+        if audio_url:
+            return audio_url
 
-        for service in self.services:
-            try:
-                return service.get_video_audio_url(video_id)
-            except Exception as e:
-                logger.error(f"Error getting audio URL with {service.__class__.__name__}: {str(e)}")
-                continue
-        raise RuntimeError("All services failed to get audio URL.")
+        audio_url = self._call_services("get_video_audio_url", (video_id,), "getting audio URL")
+        audio_url_cache.set(video_id, audio_url, ttl=get_stream_url_ttl(audio_url))
+        return audio_url
+
+    def close(self) -> None:
+        """Shut down the extraction process pool, if there is one."""
+        if self.process_pool is not None:
+            self.process_pool.shutdown()
+
+    def invalidate_audio_url(self, video_id: str) -> None:
+        """
+        Drop a cached audio URL, e.g. after playback of it failed.
+
+        Args:
+            video_id (str): The ID of the YouTube video.
+        """
+        audio_url_cache.delete(video_id)
+
+
+class AudioUrlPrefetcher:
+    """
+    Resolve audio URLs in the background so playback can start without waiting on extraction.
+
+    Resolved URLs land in the shared audio URL cache. Prefetches that are still
+    queued are cancelled when they are no longer part of the wanted set.
+    """
+    def __init__(self, youtube_video_service: YoutubeVideoService, max_workers: int = 2):
+        self.youtube_video_service = youtube_video_service
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="audio-prefetch")
+        self._futures = {}
+        self._lock = threading.Lock()
+
+    def prefetch(self, video_ids: list) -> None:
+        """
+        Queue audio URL resolution for the given videos, in priority order.
+
+        Args:
+            video_ids (list): The IDs of the videos that should be resolved.
+        """
+        wanted = set(video_ids)
+
+        with self._lock:
+            for video_id, future in list(self._futures.items()):
+                if future.done() or (video_id not in wanted and future.cancel()):
+                    del self._futures[video_id]
+
+            for video_id in video_ids:
+                if video_id in self._futures or video_id in audio_url_cache:
+                    continue
+                self._futures[video_id] = self._executor.submit(self._resolve, video_id)
+
+    def wait(self, video_id: str, timeout: float = AUDIO_PREFETCH_WAIT_TIMEOUT) -> None:
+        """
+        Wait for an in-flight prefetch of a video, so it is not resolved twice.
+
+        A prefetch that is still running after `timeout` is left to finish on
+        its own, the caller then resolves the URL itself.
+
+        Args:
+            video_id (str): The ID of the YouTube video.
+            timeout (float): The maximum number of seconds to wait.
+        """
+        with self._lock:
+            future = self._futures.get(video_id)
+
+        if future is None or future.cancel():
+            return
+
+        try:
+            future.result(timeout=timeout)
+        except FutureTimeoutError:
+            logger.warning(f"Audio URL prefetch of {video_id} still running after {timeout}s, not waiting for it")
+        except Exception:
+            pass
+
+    def cancel_all(self) -> None:
+        """Cancel every prefetch that has not started yet."""
+        with self._lock:
+            for future in self._futures.values():
+                future.cancel()
+            self._futures.clear()
+
+    def _resolve(self, video_id: str) -> None:
+        try:
+            self.youtube_video_service.get_video_audio_url(video_id)
+        except Exception as e:
+            logger.error(f"Error prefetching audio URL for {video_id}: {str(e)}")
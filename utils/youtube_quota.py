@@ -0,0 +1,186 @@
+import os
+import sqlite3
+import logging
+import threading
+from datetime import datetime, timedelta
+from zoneinfo import ZoneInfo
+from utils.cache import get_cache_dir
+
+logger = logging.getLogger(__name__)
+
+# The YouTube Data API resets its daily quota at midnight Pacific time
+QUOTA_TIMEZONE = ZoneInfo("America/Los_Angeles")
+DEFAULT_DAILY_QUOTA = 10000
+# Below this fraction of the daily quota the Google backend is tried last
+QUOTA_LOW_FRACTION = 0.2
+QUOTA_HISTORY_DAYS = 30
+
+# Units charged per Data API call
+SEARCH_LIST_COST = 100
+VIDEOS_LIST_COST = 1
+
+
+class QuotaExceededError(RuntimeError):
+    """Raised when the YouTube Data API refuses a call because the daily quota is used up."""
+
+
+def get_quota_day() -> str:
+    """Get the current quota day, the date in Pacific time."""
+    return datetime.now(QUOTA_TIMEZONE).date().isoformat()
+
+
+def is_quota_exceeded_error(error) -> bool:
+    """
+    Check whether a googleapiclient HttpError is a quota error.
+
+    Args:
+        error (HttpError): The error raised by the API client.
+
+    Returns:
+        bool: True for quotaExceeded and dailyLimitExceeded errors.
+    """
+    if getattr(getattr(error, "resp", None), "status", None) != 403:
+        return False
+
+    reasons = {detail.get("reason") for detail in getattr(error, "error_details", None) or [] if isinstance(detail, dict)}
+    if reasons:
+        return bool(reasons & {"quotaExceeded", "dailyLimitExceeded"})
+    return "quota" in str(error).lower()
+
+
+class QuotaLedger:
+    """
+    Local record of the YouTube Data API units spent today, per feature.
+
+    Usage is kept in a SQLite file so it survives restarts, and is counted per
+    Pacific-time day like the API itself does. Units are charged before a call
+    is made, since the API charges failed calls too.
+    """
+    def __init__(self, path=None, daily_limit: int = None, low_fraction: float = QUOTA_LOW_FRACTION):
+        self.path = str(path or get_cache_dir() / "youtube_quota.sqlite3")
+        if daily_limit is None:
+            daily_limit = int(os.getenv("YOUTUBE_API_DAILY_QUOTA", DEFAULT_DAILY_QUOTA))
+        self.daily_limit = daily_limit
+        self.low_fraction = low_fraction
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS quota_usage ("
+            "day TEXT NOT NULL, feature TEXT NOT NULL, units INTEGER NOT NULL, calls INTEGER NOT NULL, "
+            "PRIMARY KEY (day, feature))"
+        )
+        self._conn.execute("CREATE TABLE IF NOT EXISTS quota_exhausted (day TEXT PRIMARY KEY)")
+        oldest_day = (datetime.now(QUOTA_TIMEZONE) - timedelta(days=QUOTA_HISTORY_DAYS)).date().isoformat()
+        self._conn.execute("DELETE FROM quota_usage WHERE day < ?", (oldest_day,))
+        self._conn.execute("DELETE FROM quota_exhausted WHERE day < ?", (oldest_day,))
+        self._conn.commit()
+
+    def try_spend(self, feature: str, units: int) -> bool:
+        """
+        Charge units to a feature for today, if today's quota still covers them.
+
+        The check and the charge run in one write transaction, so concurrent
+        callers, in this process or another, cannot together overshoot the limit.
+
+        Args:
+            feature (str): What the units are spent on, e.g. "search" or "video_details".
+            units (int): The quota cost of the call.
+
+        Returns:
+            bool: True if the units were charged, False if the quota does not cover them.
+        """
+        day = get_quota_day()
+        with self._lock:
+            try:
+                self._conn.execute("BEGIN IMMEDIATE")
+                try:
+                    exhausted = self._conn.execute("SELECT 1 FROM quota_exhausted WHERE day = ?", (day,)).fetchone()
+                    used = self._conn.execute(
+                        "SELECT COALESCE(SUM(units), 0) FROM quota_usage WHERE day = ?", (day,)
+                    ).fetchone()[0]
+                    if exhausted is not None or used + units > self.daily_limit:
+                        self._conn.rollback()
+                        return False
+
+                    self._conn.execute(
+                        "INSERT INTO quota_usage (day, feature, units, calls) VALUES (?, ?, ?, 1) "
+                        "ON CONFLICT (day, feature) DO UPDATE SET units = units + excluded.units, calls = calls + 1",
+                        (day, feature, units),
+                    )
+                    self._conn.commit()
+                    return True
+                except BaseException:
+                    self._conn.rollback()
+                    raise
+            except sqlite3.Error as e:
+                logger.error(f"Error recording quota usage: {e}")
+                return False
+
+    def used(self) -> int:
+        """Get the units spent today."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT COALESCE(SUM(units), 0) FROM quota_usage WHERE day = ?", (get_quota_day(),)
+            ).fetchone()
+        return row[0]
+
+    def remaining(self) -> int:
+        """Get the units left today, 0 once the API reported the quota as exceeded."""
+        if self.is_exhausted():
+            return 0
+        return max(0, self.daily_limit - self.used())
+
+    def can_spend(self, units: int) -> bool:
+        return self.remaining() >= units
+
+    def is_low(self) -> bool:
+        return self.remaining() < self.daily_limit * self.low_fraction
+
+    def is_exhausted(self) -> bool:
+        with self._lock:
+            row = self._conn.execute("SELECT 1 FROM quota_exhausted WHERE day = ?", (get_quota_day(),)).fetchone()
+        return row is not None
+
+    def mark_exhausted(self) -> None:
+        """Record that the API refused a call for quota reasons, until the next quota day."""
+        with self._lock:
+            try:
+                self._conn.execute("INSERT OR IGNORE INTO quota_exhausted (day) VALUES (?)", (get_quota_day(),))
+                self._conn.commit()
+            except sqlite3.Error as e:
+                logger.error(f"Error recording exhausted quota: {e}")
+
+    def stats(self) -> dict:
+        """
+        Get today's usage.
+
+        Returns:
+            dict: The day, the limit, the units used and remaining, and the units and calls per feature.
+        """
+        day = get_quota_day()
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT feature, units, calls FROM quota_usage WHERE day = ? ORDER BY units DESC", (day,)
+            ).fetchall()
+
+        return {
+            "day": day,
+            "limit": self.daily_limit,
+            "used": sum(units for _, units, _ in rows),
+            "remaining": self.remaining(),
+            "exhausted": self.is_exhausted(),
+            "features": {feature: {"units": units, "calls": calls} for feature, units, calls in rows},
+        }
+
+
+_quota_ledger = None
+_quota_ledger_lock = threading.Lock()
+
+
+def get_quota_ledger() -> QuotaLedger:
+    """Get the process-wide quota ledger."""
+    global _quota_ledger
+    with _quota_ledger_lock:
+        if _quota_ledger is None:
+            _quota_ledger = QuotaLedger()
+        return _quota_ledger
@@ -0,0 +1,132 @@
+import logging
+
+logger = logging.getLogger(__name__)
+
+THUMBNAIL_BASE_URL = "https://i.ytimg.com/vi"
+# Standard thumbnail sizes, every video has these under i.ytimg.com
+THUMBNAIL_SIZES = {
+    "default": ("default.jpg", 120, 90),
+    "medium": ("mqdefault.jpg", 320, 180),
+    "high": ("hqdefault.jpg", 480, 360),
+}
+
+
+def load_video_description(video_id: str) -> str:
+    """
+    Fetch the description of a video with pytubefix.
+
+    Args:
+        video_id (str): The ID of the YouTube video.
+
+    Returns:
+        str: The description, or an empty string if it could not be fetched.
+    """
+    from pytubefix import YouTube
+
+    try:
+        return YouTube(url=f"https://www.youtube.com/watch?v={video_id}").description or ""
+    except Exception as e:
+        logger.error(f"Error fetching description of {video_id}: {str(e)}")
+        return ""
+
+
+class YoutubeVideo:
+    """
+    A YouTube search result, as returned by every backend.
+
+    Only the fields shown in result lists are stored. URLs and the thumbnail
+    map are derived from the video ID, and the description is fetched on first
+    access, so large result lists and caches stay small.
+    """
+    __slots__ = ("video_id", "title", "channel_title", "channel_id", "views", "length", "_description")
+
+    def __init__(self, video_id: str, title: str = "", channel_title: str = "", channel_id: str = "",
+                 views: int = 0, length: int = 0, description: str = None):
+        self.video_id = video_id
+        self.title = title or video_id
+        self.channel_title = channel_title or ""
+        self.channel_id = channel_id or ""
+        self.views = int(views or 0)
+        self.length = int(length or 0)
+        self._description = description
+
+    @property
+    def description(self) -> str:
+        """The description of the video, fetched over the network the first time it is read."""
+        if self._description is None:
+            self._description = load_video_description(self.video_id)
+        return self._description
+
+    @description.setter
+    def description(self, value: str) -> None:
+        self._description = value
+
+    @property
+    def loaded_description(self) -> str:
+        """The description if it is already known, None otherwise. Never goes to the network."""
+        return self._description
+
+    @property
+    def is_partial(self) -> bool:
+        """True when only the ID is known, e.g. a search result whose metadata could not be fetched."""
+        return self.title == self.video_id and not self.channel_title
+
+    @property
+    def watch_url(self) -> str:
+        return f"https://www.youtube.com/watch?v={self.video_id}"
+
+    @property
+    def embed_url(self) -> str:
+        return f"https://www.youtube.com/embed/{self.video_id}"
+
+    @property
+    def thumbnails(self) -> dict:
+        """The thumbnail map, in the shape of the YouTube Data API."""
+        return {
+            name: {"url": f"{THUMBNAIL_BASE_URL}/{self.video_id}/{filename}", "width": width, "height": height}
+            for name, (filename, width, height) in THUMBNAIL_SIZES.items()
+        }
+
+    @property
+    def thumbnail_url(self) -> str:
+        """The URL of the mid-sized thumbnail."""
+        return f"{THUMBNAIL_BASE_URL}/{self.video_id}/{THUMBNAIL_SIZES['medium'][0]}"
+
+    def to_dict(self) -> dict:
+        """
+        Serialize the video for JSON caches. The description is left out.
+
+        Returns:
+            dict: The stored fields of the video.
+        """
+        return {
+            "video_id": self.video_id,
+            "title": self.title,
+            "channel_title": self.channel_title,
+            "channel_id": self.channel_id,
+            "views": self.views,
+            "length": self.length,
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "YoutubeVideo":
+        """
+        Build a video from a dict written by to_dict. Unknown keys are ignored.
+
+        Args:
+            data (dict): The serialized video.
+
+        Returns:
+            YoutubeVideo: The video.
+        """
+        return cls(
+            video_id=data.get("video_id") or data.get("id", ""),
+            title=data.get("title", ""),
+            channel_title=data.get("channel_title", ""),
+            channel_id=data.get("channel_id", ""),
+            views=data.get("views", 0),
+            length=data.get("length", 0),
+        )
+
+    def __repr__(self) -> str:
+        return f"YoutubeVideo(video_id={self.video_id!r}, title={self.title!r})"